@@ -0,0 +1,182 @@
+# Import StreamController modules
+from GtkHelper.GtkHelper import BetterPreferencesGroup
+from src.backend.PluginManager.ActionBase import ActionBase
+
+# Import python modules
+import os
+import time
+
+# Import gtk modules - used for the config rows
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Gtk, Adw, GLib
+
+# Import internal modules
+from ...internal.MatchSpec import MatchSpec
+from ...internal.MatchSuggestions import MatchSuggestions
+from ...internal.WindowMatchAction import WindowMatchAction
+
+class Layout(WindowMatchAction, ActionBase):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.has_configuration = True
+        self.layout_specs: list[MatchSpec] = None
+        self.tolerance = 0
+        self.rule_rows: list[Adw.ExpanderRow] = []
+        # Only the connection label and teardown are used, the rules have their own specs and rows
+        self.init_window_match()
+
+    def on_ready(self) -> None:
+        icon_path = os.path.join(self.plugin_base.PATH, "assets", "move-resize.png")
+        self.set_media(media_path=icon_path, size=0.75)
+        self.update_layout_specs()
+        self.on_connection_state_changed(self.plugin_base.window_manager.get_connection_state())
+
+    def get_rules(self) -> list[dict]:
+        return self.get_settings().get("rules", [])
+
+    def set_rules(self, rules: list[dict]) -> None:
+        settings = self.get_settings()
+        settings["rules"] = rules
+        self.set_settings(settings)
+        self.update_layout_specs()
+
+    def update_layout_specs(self) -> None:
+        settings = self.get_settings()
+        self.layout_specs = [MatchSpec.from_settings(rule) for rule in settings.get("rules", [])]
+        self.tolerance = int(settings.get("tolerance", 0))
+        self.plugin_base.match_registry.register(self, self.layout_specs)
+
+    def get_config_rows(self) -> list:
+        self.tolerance_spinner = Adw.SpinRow.new_with_range(0, 500, 1)
+        self.tolerance_spinner.set_title(self.plugin_base.lm.get("actions.tolerance.title"))
+        self.tolerance_spinner.set_value(self.get_settings().get("tolerance", 0))
+        self.tolerance_spinner.connect("changed", self.on_tolerance_changed)
+        return [self.tolerance_spinner]
+
+    def on_tolerance_changed(self, *args) -> None:
+        settings = self.get_settings()
+        settings["tolerance"] = int(self.tolerance_spinner.get_value())
+        self.set_settings(settings)
+        self.update_layout_specs()
+
+    def get_custom_config_area(self):
+        self.main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, hexpand=True, margin_start=4, margin_end=4)
+
+        self.title = Gtk.Label(label=self.plugin_base.lm.get("actions.layout.rules"), css_classes=["page-header"], xalign=0, margin_top=10, margin_bottom=10)
+        self.main_box.append(self.title)
+
+        self.preferences_group = BetterPreferencesGroup()
+        self.main_box.append(self.preferences_group)
+
+        button_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6, margin_top=10, homogeneous=True)
+        self.add_button = Gtk.Button(label=self.plugin_base.lm.get("actions.layout.add_rule"))
+        self.add_button.connect("clicked", self.on_add_rule)
+        button_box.append(self.add_button)
+
+        self.capture_button = Gtk.Button(label=self.plugin_base.lm.get("actions.layout.capture"))
+        self.capture_button.connect("clicked", self.on_capture)
+        button_box.append(self.capture_button)
+        self.main_box.append(button_box)
+
+        self.load_rule_rows()
+        return self.main_box
+
+    def load_rule_rows(self) -> None:
+        for row in self.rule_rows:
+            self.preferences_group.remove(row)
+        self.rule_rows = [self.generate_rule_row(index, rule) for index, rule in enumerate(self.get_rules())]
+        for row in self.rule_rows:
+            self.preferences_group.add(row)
+
+    def generate_rule_row(self, index: int, rule: dict) -> Adw.ExpanderRow:
+        expander = Adw.ExpanderRow()
+
+        wm_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.wm_class_regex_entry.title"), text=rule.get("wm_class", ".*"))
+        title_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.title_regex_entry.title"), text=rule.get("title", ".*"))
+        expander.add_row(wm_row)
+        expander.add_row(title_row)
+        suggestions = MatchSuggestions(self.plugin_base.suggestion_index, self.plugin_base.lm, wm_row, title_row,
+                                       lambda: self.layout_specs[index] if index < len(self.layout_specs or []) else None)
+
+        spinners = {}
+        for group, field, locale_key in [("position", "x", "actions.x_position.title"), ("position", "y", "actions.y_position.title"),
+                                         ("size", "width", "actions.width.title"), ("size", "height", "actions.height.title")]:
+            spinner = Adw.SpinRow.new_with_range(0, 8000, 1)
+            spinner.set_title(self.plugin_base.lm.get(locale_key))
+            spinner.set_value(rule.get(group, {}).get(field, 0))
+            expander.add_row(spinner)
+            spinners[field] = spinner
+
+        remove_button = Gtk.Button(icon_name="user-trash-symbolic", valign=Gtk.Align.CENTER, css_classes=["flat"],
+                                   tooltip_text=self.plugin_base.lm.get("actions.layout.remove_rule"))
+        remove_button.connect("clicked", self.on_remove_rule, index)
+        expander.add_suffix(remove_button)
+
+        def on_changed(*args):
+            rules = self.get_rules()
+            if index >= len(rules):
+                return
+            rules[index] = {
+                "wm_class": wm_row.get_text(),
+                "title": title_row.get_text(),
+                "position": {"x": int(spinners["x"].get_value()), "y": int(spinners["y"].get_value())},
+                "size": {"width": int(spinners["width"].get_value()), "height": int(spinners["height"].get_value())}
+            }
+            expander.set_title(GLib.markup_escape_text(wm_row.get_text()))
+            expander.set_subtitle(GLib.markup_escape_text(title_row.get_text()))
+            self.set_rules(rules)
+            suggestions.update_count()
+
+        for row in [wm_row, title_row, *spinners.values()]:
+            row.connect("changed", on_changed)
+
+        expander.set_title(GLib.markup_escape_text(rule.get("wm_class", ".*")))
+        expander.set_subtitle(GLib.markup_escape_text(rule.get("title", ".*")))
+        return expander
+
+    def on_add_rule(self, *args) -> None:
+        rules = self.get_rules()
+        rules.append({"wm_class": ".*", "title": ".*", "position": {"x": 0, "y": 0}, "size": {"width": 800, "height": 600}})
+        self.set_rules(rules)
+        self.load_rule_rows()
+
+    def on_remove_rule(self, button, index: int) -> None:
+        rules = self.get_rules()
+        if index < len(rules):
+            rules.pop(index)
+        self.set_rules(rules)
+        self.load_rule_rows()
+
+    def on_capture(self, *args) -> None:
+        self.capture_button.set_sensitive(False)
+        future = self.plugin_base.async_window_manager.capture_layout()
+        future.add_done_callback(lambda future: GLib.idle_add(self.on_capture_done, future))
+
+    def on_capture_done(self, future) -> bool:
+        self.capture_button.set_sensitive(True)
+        if future.cancelled() or future.exception() is not None:
+            return False
+        rules = future.result()
+        if rules:
+            self.set_rules(rules)
+            self.load_rule_rows()
+        return False
+
+    def on_key_down(self) -> None:
+        start = time.perf_counter()
+        if self.layout_specs is None:
+            self.update_layout_specs()
+        if not self.layout_specs:
+            return
+        self.submit_in_background(self.apply_layout, self.layout_specs, self.tolerance, start)
+
+    def apply_layout(self, specs: list[MatchSpec], tolerance: int = None, start: float = None) -> None:
+        # One snapshot for all rules, then one concurrent batch for all windows
+        window_manager = self.plugin_base.window_manager
+        matches = self.plugin_base.match_registry.find_windows_many(specs)
+        result = window_manager.apply_geometries(window_manager.resolve_layout(specs, matches), tolerance=tolerance)
+        if start is not None:
+            window_manager.stats.record("action.Layout", time.perf_counter() - start, error=not result.ok())
@@ -7,6 +7,7 @@ from src.backend.PluginManager.PluginBase import PluginBase
 
 # Import python modules
 import os
+import time
 
 # Import gtk modules - used for the config rows
 import gi
@@ -16,19 +17,36 @@ from gi.repository import Gtk, Adw
 
 import globals as gl
 
-class MoveResize(ActionBase):
+# Import internal modules
+from ...internal.MatchSpec import MatchSpec
+from ...internal.WindowMatchAction import WindowMatchAction
+from ...internal.WindowAnimator import EASINGS
+
+class MoveResize(WindowMatchAction, ActionBase):
+    # Geometry fields the dial can adjust
+    DIAL_AXES = ["x", "y", "width", "height"]
+    EASINGS = list(EASINGS.keys())
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
         self.has_configuration = True
+        self.init_window_match()
+        self.init_dial()
+        # Animation duration in seconds, 0 moves the windows in one step
+        self.animation_duration: float = 0
+        self.animation_easing = "ease_in_out"
         
     def on_ready(self) -> None:
         icon_path = os.path.join(self.plugin_base.PATH, "assets", "move-resize.png")
         self.set_media(media_path=icon_path, size=0.75)
-        
+        self.update_match_spec()
+        self.load_dial_settings()
+        self.load_animation_settings()
+        self.on_connection_state_changed(self.plugin_base.window_manager.get_connection_state())
+
     def get_config_rows(self) -> list:
-        self.wm_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.wm_class_regex_entry.title"), text=".*")
-        self.title_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.title_regex_entry.title"), text=".*")
+        match_rows = self.create_match_rows()
 
         self.x_spinner = Adw.SpinRow.new_with_range(0, 8000, 1)
         self.y_spinner = Adw.SpinRow.new_with_range(0, 8000, 1)
@@ -40,51 +58,90 @@ class MoveResize(ActionBase):
         self.x_spinner.set_title(self.plugin_base.lm.get("actions.x_position.title"))
         self.y_spinner.set_title(self.plugin_base.lm.get("actions.y_position.title"))
 
+        tolerance_row = self.create_tolerance_row()
+        dial_rows = self.create_dial_rows()
+
+        self.animation_duration_spinner = Adw.SpinRow.new_with_range(0, 5000, 50)
+        self.animation_duration_spinner.set_title(self.plugin_base.lm.get("actions.animation_duration.title"))
+        self.animation_easing_row = Adw.ComboRow(
+            title=self.plugin_base.lm.get("actions.animation_easing.title"),
+            model=Gtk.StringList.new([self.plugin_base.lm.get(f"actions.easing.{easing}") for easing in self.EASINGS])
+        )
+
         self.load_defaults()
+        self.connect_match_rows()
+        self.connect_geometry_rows()
 
-        self.wm_row.connect("changed", self.on_row_changed)
-        self.title_row.connect("changed", self.on_row_changed)
         self.x_spinner.connect("changed", self.on_row_changed)
         self.y_spinner.connect("changed", self.on_row_changed)
         self.width_spinner.connect("changed", self.on_row_changed)
         self.height_spinner.connect("changed", self.on_row_changed)
+        self.animation_duration_spinner.connect("changed", self.on_row_changed)
+        self.animation_easing_row.connect("notify::selected", self.on_row_changed)
 
-        return [self.wm_row, self.title_row, self.x_spinner, self.y_spinner, self.width_spinner, self.height_spinner]
+        return match_rows + [self.x_spinner, self.y_spinner, self.width_spinner, self.height_spinner, tolerance_row, self.animation_duration_spinner, self.animation_easing_row] + dial_rows
     
     def load_defaults(self) -> None:
         settings = self.get_settings()
-        self.wm_row.set_text(settings.get("wm_class", ".*"))
-        self.title_row.set_text(settings.get("title", ".*"))
+        self.load_match_defaults(settings)
         self.x_spinner.set_value(settings.get("position", {}).get("x", 0))
         self.y_spinner.set_value(settings.get("position", {}).get("y", 0))
         self.width_spinner.set_value(settings.get("size", {}).get("width", 0))
         self.height_spinner.set_value(settings.get("size", {}).get("height", 0))
+        self.load_geometry_defaults(settings)
+        animation = settings.get("animation", {})
+        self.animation_duration_spinner.set_value(animation.get("duration", 0))
+        if animation.get("easing") in self.EASINGS:
+            self.animation_easing_row.set_selected(self.EASINGS.index(animation["easing"]))
+        else:
+            self.animation_easing_row.set_selected(self.EASINGS.index("ease_in_out"))
     
     def on_row_changed(self, *args) -> None:
         settings = self.get_settings()
-        settings["wm_class"] = self.wm_row.get_text()
-        settings["title"] = self.title_row.get_text()
+        self.store_match_settings(settings)
         settings.setdefault("position", {})
         settings["position"]["x"] = int(self.x_spinner.get_value())
         settings["position"]["y"] = int(self.y_spinner.get_value())
         settings.setdefault("size", {})
         settings["size"]["width"] = int(self.width_spinner.get_value())
         settings["size"]["height"] = int(self.height_spinner.get_value())
+        self.store_geometry_settings(settings)
+        settings["animation"] = {
+            "duration": int(self.animation_duration_spinner.get_value()),
+            "easing": self.EASINGS[self.animation_easing_row.get_selected()]
+        }
         self.set_settings(settings)
+        self.on_match_settings_changed()
+        self.load_dial_settings()
+        self.load_animation_settings()
+
+    def load_animation_settings(self) -> None:
+        animation = self.get_settings().get("animation", {})
+        self.animation_duration = int(animation.get("duration", 0)) / 1000
+        self.animation_easing = animation.get("easing", "ease_in_out")
 
     def on_key_down(self):
-        settings = self.get_settings()
-        wm = settings.get("wm_class", "")
-        title = settings.get("title", "")
-        x = settings.get("position", {}).get("x")
-        y = settings.get("position", {}).get("y")
-        width = settings.get("size", {}).get("width")
-        height = settings.get("size", {}).get("height")
-
-        if None in [wm, title, x, y, width, height]:
+        start = time.perf_counter()
+        spec = self.get_match_spec()
+        if not spec.is_valid() or None in [spec.position, spec.size]:
             return
-        
-        matching_windows = self.plugin_base.window_manager.find_windows_by_class_and_title(wm, title)
-        for window_id in matching_windows:
-            print("move resize")
-            self.plugin_base.window_manager.move_resize_window(window_id, x, y, width, height)
\ No newline at end of file
+        if self.animation_duration > 0:
+            self.submit_in_background(self.animate_matching_windows, spec, self.animation_duration, self.animation_easing, start)
+        else:
+            self.submit_in_background(self.move_resize_matching_windows, spec, start)
+
+    def animate_matching_windows(self, spec: MatchSpec, duration: float, easing: str, start: float = None) -> None:
+        window_ids = self.plugin_base.match_registry.find_windows(spec)
+        self.plugin_base.window_animator.animate_windows(window_ids, spec.get_geometry(), duration, easing, tolerance=spec.tolerance)
+        # Measured until the animation is running, its frames are sent on the frame tick
+        if start is not None:
+            self.plugin_base.window_manager.stats.record("action.MoveResize", time.perf_counter() - start)
+
+    def move_resize_matching_windows(self, spec: MatchSpec, start: float = None) -> None:
+        window_manager = self.plugin_base.window_manager
+        result = window_manager.move_resize_many(self.plugin_base.match_registry.find_windows(spec), position=spec.position, size=spec.size, tolerance=spec.tolerance)
+        if start is not None:
+            window_manager.stats.record("action.MoveResize", time.perf_counter() - start, error=not result.ok())
+
+    def on_dial_turn(self, direction: int) -> None:
+        self.dial.turn(self.get_match_spec(), direction, self.dial_steps)
\ No newline at end of file
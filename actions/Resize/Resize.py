@@ -7,6 +7,7 @@ from src.backend.PluginManager.PluginBase import PluginBase
 
 # Import python modules
 import os
+import time
 
 # Import gtk modules - used for the config rows
 import gi
@@ -16,19 +17,30 @@ from gi.repository import Gtk, Adw
 
 import globals as gl
 
-class Resize(ActionBase):
+# Import internal modules
+from ...internal.MatchSpec import MatchSpec
+from ...internal.WindowMatchAction import WindowMatchAction
+
+class Resize(WindowMatchAction, ActionBase):
+    # Geometry fields the dial can adjust
+    DIAL_AXES = ["width", "height"]
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        
+
         self.has_configuration = True
-        
+        self.init_window_match()
+        self.init_dial()
+
     def on_ready(self) -> None:
         icon_path = os.path.join(self.plugin_base.PATH, "assets", "resize.png")
         self.set_media(media_path=icon_path, size=0.75)
-        
+        self.update_match_spec()
+        self.load_dial_settings()
+        self.on_connection_state_changed(self.plugin_base.window_manager.get_connection_state())
+
     def get_config_rows(self) -> list:
-        self.wm_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.wm_class_regex_entry.title"), text=".*")
-        self.title_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.title_regex_entry.title"), text=".*")
+        match_rows = self.create_match_rows()
 
         self.width_spinner = Adw.SpinRow.new_with_range(0, 8000, 1)
         self.height_spinner = Adw.SpinRow.new_with_range(0, 8000, 1)
@@ -36,41 +48,45 @@ class Resize(ActionBase):
         self.width_spinner.set_title(self.plugin_base.lm.get("actions.width.title"))
         self.height_spinner.set_title(self.plugin_base.lm.get("actions.height.title"))
 
+        tolerance_row = self.create_tolerance_row()
+        dial_rows = self.create_dial_rows()
+
         self.load_defaults()
+        self.connect_match_rows()
+        self.connect_geometry_rows()
 
-        self.wm_row.connect("changed", self.on_row_changed)
-        self.title_row.connect("changed", self.on_row_changed)
         self.width_spinner.connect("changed", self.on_row_changed)
         self.height_spinner.connect("changed", self.on_row_changed)
 
-        return [self.wm_row, self.title_row, self.width_spinner, self.height_spinner]
-    
+        return match_rows + [self.width_spinner, self.height_spinner, tolerance_row] + dial_rows
+
     def load_defaults(self) -> None:
         settings = self.get_settings()
-        self.wm_row.set_text(settings.get("wm_class", ".*"))
-        self.title_row.set_text(settings.get("title", ".*"))
+        self.load_match_defaults(settings)
         self.width_spinner.set_value(settings.get("size", {}).get("width", 0))
         self.height_spinner.set_value(settings.get("size", {}).get("height", 0))
-    
+        self.load_geometry_defaults(settings)
+
     def on_row_changed(self, *args) -> None:
         settings = self.get_settings()
-        settings["wm_class"] = self.wm_row.get_text()
-        settings["title"] = self.title_row.get_text()
+        self.store_match_settings(settings)
         settings.setdefault("size", {})
         settings["size"]["width"] = int(self.width_spinner.get_value())
         settings["size"]["height"] = int(self.height_spinner.get_value())
+        self.store_geometry_settings(settings)
         self.set_settings(settings)
+        self.on_match_settings_changed()
+        self.load_dial_settings()
 
     def on_key_down(self):
-        settings = self.get_settings()
-        wm = settings.get("wm_class", "")
-        title = settings.get("title", "")
-        width = settings.get("size", {}).get("width")
-        height = settings.get("size", {}).get("height")
-
-        if None in [wm, title, width, height]:
+        start = time.perf_counter()
+        spec = self.get_match_spec()
+        if not spec.is_valid() or spec.size is None:
             return
-        
-        matching_windows = self.plugin_base.window_manager.find_windows_by_class_and_title(wm, title)
-        for window_id in matching_windows:
-            self.plugin_base.window_manager.resize_window_to(window_id, width, height)
\ No newline at end of file
+        self.submit_in_background(self.resize_matching_windows, spec, start)
+
+    def resize_matching_windows(self, spec: MatchSpec, start: float = None) -> None:
+        window_manager = self.plugin_base.window_manager
+        result = window_manager.move_resize_many(self.plugin_base.match_registry.find_windows(spec), size=spec.size, tolerance=spec.tolerance)
+        if start is not None:
+            window_manager.stats.record("action.Resize", time.perf_counter() - start, error=not result.ok())
@@ -1,5 +1,5 @@
 # Import StreamController modules
-from GtkHelper.GtkHelper import BetterPreferencesGroup, AttributeRow
+from GtkHelper.GtkHelper import AttributeRow
 from src.backend.PluginManager.ActionBase import ActionBase
 from src.backend.DeckManagement.DeckController import DeckController
 from src.backend.PageManagement.Page import Page
@@ -7,24 +7,69 @@ from src.backend.PluginManager.PluginBase import PluginBase
 
 # Import python modules
 import os
+import time
+from concurrent.futures import Future
 
 # Import gtk modules - used for the config rows
 import gi
 gi.require_version("Gtk", "4.0")
 gi.require_version("Adw", "1")
-from gi.repository import Gtk, Adw, GLib
+from gi.repository import Gtk, Adw, GLib, Gio, GObject
 
 import globals as gl
 
-class Status(ActionBase):
+# Import internal modules
+from ...internal.MatchSpec import MatchSpec
+from ...internal.WindowMatchAction import WindowMatchAction
+from ...internal.WindowInfo import WindowInfo
+from ...internal.BusWorker import PRIORITY_BACKGROUND
+
+class WindowItem(GObject.Object):
+    # Entry of the matching windows list model
+    def __init__(self, window: WindowInfo):
+        super().__init__()
+        self.window = window
+
+class Status(WindowMatchAction, ActionBase):
+    # Wait for typing to pause this long before querying the windows again
+    REFRESH_DELAY_MS = 200
+    # Details of expanded rows older than this are fetched again on the next expand
+    DETAILS_MAX_AGE = 5
+    # Locale key and WindowInfo field of the rows shown when a window is expanded
+    DETAIL_FIELDS = [("actions.status.wm_class", "wm_class"), ("actions.x_position.title", "x"), ("actions.y_position.title", "y"),
+                     ("actions.width.title", "width"), ("actions.height.title", "height")]
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         
         self.has_configuration = True
+        self.init_window_match()
+
+        self.refresh_source_id: int = None
+        self.refresh_future: Future = None
+        self.refresh_serial = 0
+        # Matching windows, rows are only created for the visible ones
+        self.window_store = Gio.ListStore(item_type=WindowItem)
+        # window id -> (fetch time, Details()), filled when a row gets expanded
+        self.details_cache: dict[int, tuple[float, WindowInfo]] = {}
+        self.details_pending: set[int] = set()
+        self.expanded_ids: set[int] = set()
+        # window id -> currently bound rows
+        self.bound_rows: dict[int, set[Adw.ExpanderRow]] = {}
         
     def on_ready(self) -> None:
         icon_path = os.path.join(self.plugin_base.PATH, "assets", "info.png")
         self.set_media(media_path=icon_path, size=0.75)
+        self.update_match_spec()
+        self.on_connection_state_changed(self.plugin_base.window_manager.get_connection_state())
+
+    def on_removed_from_cache(self) -> None:
+        super().on_removed_from_cache()
+        if self.refresh_source_id is not None:
+            GLib.source_remove(self.refresh_source_id)
+            self.refresh_source_id = None
+        if self.refresh_future is not None:
+            self.refresh_future.cancel()
         
     def on_key_down(self) -> None:
         if not gl.app.main_win.get_visible():
@@ -41,29 +86,18 @@ class Status(ActionBase):
         GLib.idle_add(gl.app.main_win.sidebar.show_action_configurator)
     
     def get_config_rows(self) -> list:
-        self.wm_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.wm_class_regex_entry.title"), text=".*")
-        self.title_row = Adw.EntryRow(title=self.plugin_base.lm.get("actions.title_regex_entry.title"), text=".*")
-
-        self.load_defaults()
-
-        self.wm_row.connect("changed", self.on_row_changed)
-        self.title_row.connect("changed", self.on_row_changed)
-
-        return [self.wm_row, self.title_row]
-    
-    def load_defaults(self) -> None:
-        settings = self.get_settings()
-        self.wm_row.set_text(settings.get("wm_class", ".*"))
-        self.title_row.set_text(settings.get("title", ".*"))
+        match_rows = self.create_match_rows()
+        self.load_match_defaults(self.get_settings())
+        self.connect_match_rows()
+        return match_rows
 
     def on_row_changed(self, *args) -> None:
-        self.update_box()
-
         settings = self.get_settings()
-        settings["wm_class"] = self.wm_row.get_text()
-        settings["title"] = self.title_row.get_text()
+        self.store_match_settings(settings)
         self.set_settings(settings)
+        self.on_match_settings_changed()
 
+        self.update_box()
 
     def get_custom_config_area(self):
         self.main_box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, hexpand=True, margin_start=4, margin_end=4)
@@ -71,30 +105,151 @@ class Status(ActionBase):
         self.title = Gtk.Label(label=self.plugin_base.lm.get("actions.status.matching_windows"), css_classes=["page-header"], xalign=0, margin_top=10, margin_bottom=10)
         self.main_box.append(self.title)
 
-        self.preferences_group = BetterPreferencesGroup()
-        self.main_box.append(self.preferences_group)
-        self.update_box()
-        return self.main_box
-    
-    def update_box(self):
-        wm_regex = self.wm_row.get_text()
-        title_regex = self.title_row.get_text()
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self.on_row_setup)
+        factory.connect("bind", self.on_row_bind)
+        factory.connect("unbind", self.on_row_unbind)
 
+        # The list view needs its own scrolled window, otherwise every row gets created
+        self.window_list = Gtk.ListView(model=Gtk.NoSelection(model=self.window_store), factory=factory, css_classes=["card"])
+        scrolled_window = Gtk.ScrolledWindow(child=self.window_list, hscrollbar_policy=Gtk.PolicyType.NEVER,
+                                             propagate_natural_height=True, max_content_height=400)
+        self.main_box.append(scrolled_window)
 
-        self.preferences_group.clear()
-        window_ids = self.plugin_base.window_manager.find_windows_by_class_and_title(wm_regex, title_regex)
-        for window_id in window_ids:
-            details = self.plugin_base.window_manager.get_window_details(window_id)
-            expander = self.generate_expander_from_details(details=details)
-            self.preferences_group.add(expander)
-
-    def generate_expander_from_details(self, details: dict) -> Adw.ExpanderRow:
-        expander = Adw.ExpanderRow(title=details["title"], subtitle=details["wm_class"])
-
-        expander.add_row(AttributeRow(title=self.plugin_base.lm.get("actions.status.wm_class"), attr=details.get("wm_class", "N/A")))
-        expander.add_row(AttributeRow(title=self.plugin_base.lm.get("actions.x_position.title"), attr=details.get("x", "N/A")))
-        expander.add_row(AttributeRow(title=self.plugin_base.lm.get("actions.y_position.title"), attr=details.get("y", "N/A")))
-        expander.add_row(AttributeRow(title=self.plugin_base.lm.get("actions.width.title"), attr=details.get("width", "N/A")))
-        expander.add_row(AttributeRow(title=self.plugin_base.lm.get("actions.height.title"), attr=details.get("height", "N/A")))
+        # Rows of a previous config area are gone
+        self.bound_rows.clear()
+        self.refresh_box()
+        return self.main_box
 
-        return expander
\ No newline at end of file
+    def on_row_setup(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem) -> None:
+        expander = Adw.ExpanderRow()
+        expander.detail_rows = {}
+        for locale_key, field in self.DETAIL_FIELDS:
+            row = AttributeRow(title=self.plugin_base.lm.get(locale_key), attr="...")
+            expander.add_row(row)
+            expander.detail_rows[field] = row
+        expander.window_id = None
+        expander.connect("notify::expanded", self.on_row_expanded)
+        list_item.set_child(expander)
+
+    def on_row_bind(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem) -> None:
+        expander = list_item.get_child()
+        window = list_item.get_item().window
+        expander.window_id = None
+        expander.set_title(GLib.markup_escape_text(window.title or ""))
+        expander.set_subtitle(GLib.markup_escape_text(window.wm_class or ""))
+        expander.set_expanded(window.id in self.expanded_ids)
+        cached = self.details_cache.get(window.id)
+        self.show_details(expander, cached[1] if cached is not None else None)
+
+        # Set last, so restoring the expanded state above does not count as a user expand
+        expander.window_id = window.id
+        self.bound_rows.setdefault(window.id, set()).add(expander)
+
+    def on_row_unbind(self, factory: Gtk.SignalListItemFactory, list_item: Gtk.ListItem) -> None:
+        expander = list_item.get_child()
+        self.bound_rows.get(expander.window_id, set()).discard(expander)
+        expander.window_id = None
+
+    def on_row_expanded(self, expander: Adw.ExpanderRow, *args) -> None:
+        window_id = expander.window_id
+        if window_id is None:
+            return
+        if not expander.get_expanded():
+            self.expanded_ids.discard(window_id)
+            return
+        self.expanded_ids.add(window_id)
+        self.load_details(window_id)
+
+    def load_details(self, window_id: int) -> None:
+        cached = self.details_cache.get(window_id)
+        if cached is not None and time.monotonic() - cached[0] < self.DETAILS_MAX_AGE:
+            return
+        if window_id in self.details_pending:
+            return
+        self.details_pending.add(window_id)
+        future = self.plugin_base.async_window_manager.get_window_details(window_id)
+        future.add_done_callback(lambda future: GLib.idle_add(self.on_details_loaded, window_id, future))
+
+    def on_details_loaded(self, window_id: int, future: Future) -> bool:
+        self.details_pending.discard(window_id)
+        if future.cancelled() or future.exception() is not None or future.result() is None:
+            return False
+        self.details_cache[window_id] = (time.monotonic(), future.result())
+        for expander in self.bound_rows.get(window_id, set()):
+            self.show_details(expander, future.result())
+        return False
+
+    def show_details(self, expander: Adw.ExpanderRow, details: WindowInfo) -> None:
+        for field, row in expander.detail_rows.items():
+            value = None if details is None else getattr(details, field)
+            row.update_attribute("..." if details is None else "N/A" if value is None else str(value))
+
+    def update_box(self) -> None:
+        ## Debounce, only the last change within REFRESH_DELAY_MS triggers a query
+        if self.refresh_source_id is not None:
+            GLib.source_remove(self.refresh_source_id)
+        self.refresh_source_id = GLib.timeout_add(self.REFRESH_DELAY_MS, self.refresh_box)
+
+    def refresh_box(self) -> bool:
+        self.refresh_source_id = None
+        ## Supersede the previous query
+        self.refresh_serial += 1
+        serial = self.refresh_serial
+        if self.refresh_future is not None:
+            self.refresh_future.cancel()
+
+        self.refresh_future = self.plugin_base.async_window_manager.submit(self.query_matching_windows, self.get_match_spec(), serial, priority=PRIORITY_BACKGROUND)
+        self.refresh_future.add_done_callback(lambda future: self.on_query_done(future, serial))
+        return False
+
+    def query_matching_windows(self, spec: MatchSpec, serial: int) -> list[WindowInfo]:
+        # Runs on a worker thread. Only List() data and titles, Details() are loaded per expanded row.
+        window_ids = self.plugin_base.match_registry.find_windows(spec)
+        if serial != self.refresh_serial:
+            return None
+        return self.plugin_base.window_manager.get_windows_info(window_ids)
+
+    def on_query_done(self, future: Future, serial: int) -> None:
+        if future.cancelled() or future.exception() is not None:
+            return
+        windows = future.result()
+        if windows is None:
+            return
+        GLib.idle_add(self.apply_matching_windows, windows, serial)
+
+    def apply_matching_windows(self, windows: list[WindowInfo], serial: int) -> bool:
+        if serial != self.refresh_serial:
+            return False
+
+        current = [self.window_store.get_item(index).window for index in range(self.window_store.get_n_items())]
+        if current == windows:
+            return False
+
+        ## Forget details of windows that changed or no longer match
+        old = {window.id: window for window in current}
+        matching = {window.id: window for window in windows}
+        for window_id in list(self.details_cache.keys()):
+            if matching.get(window_id) != old.get(window_id):
+                self.details_cache.pop(window_id)
+        self.expanded_ids.intersection_update(matching.keys())
+
+        ## Remove windows that no longer match, back to front so the positions stay valid
+        for position in reversed(range(len(current))):
+            if current[position].id not in matching:
+                self.window_store.remove(position)
+
+        ## Replace only the items whose window changed, so the other rows keep their binding, scroll and focus
+        for position in range(self.window_store.get_n_items()):
+            window = matching[self.window_store.get_item(position).window.id]
+            if window != self.window_store.get_item(position).window:
+                self.window_store.splice(position, 1, [WindowItem(window)])
+
+        ## Add new windows at the end
+        new_items = [WindowItem(window) for window in windows if window.id not in old]
+        if new_items:
+            self.window_store.splice(self.window_store.get_n_items(), 0, new_items)
+
+        for window_id in self.expanded_ids:
+            self.load_details(window_id)
+        return False
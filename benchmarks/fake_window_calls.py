@@ -0,0 +1,158 @@
+# Stand-in for the Window Calls gnome extension (org.gnome.Shell.Extensions.Windows).
+# Serves a configurable number of synthetic windows on the session bus and delays every reply by --latency-ms.
+# Replies are delayed on the main loop instead of blocking it, so concurrent calls overlap like on a real bus.
+#
+# Usage: python -m benchmarks.fake_window_calls --windows 100 --latency-ms 2
+
+# Import python modules
+import argparse
+import json
+import random
+
+import dbus
+import dbus.service
+from dbus.mainloop.glib import DBusGMainLoop
+from gi.repository import GLib
+
+BUS_NAME = "org.gnome.Shell"
+OBJECT_PATH = "/org/gnome/Shell/Extensions/Windows"
+INTERFACE = "org.gnome.Shell.Extensions.Windows"
+
+WM_CLASSES = [
+    "org.gnome.Terminal", "firefox", "Code", "org.gnome.Nautilus", "Slack",
+    "obs", "discord", "Spotify", "thunderbird", "org.gnome.TextEditor"
+]
+
+def generate_windows(count: int, seed: int = 0) -> dict[int, dict]:
+    rng = random.Random(seed)
+    windows = {}
+    for i in range(count):
+        window_id = 1000000 + i * 7
+        wm_class = WM_CLASSES[i % len(WM_CLASSES)]
+        windows[window_id] = {
+            "id": window_id,
+            "wm_class": wm_class,
+            "wm_class_instance": wm_class.lower(),
+            "pid": 2000 + i,
+            "title": f"{wm_class} window {i}",
+            "in_current_workspace": i % 3 == 0,
+            "monitor": i % 2,
+            "focus": i == 0,
+            "minimized": i % 5 == 4,
+            "maximized": 0,
+            "frame_type": 0,
+            "window_type": 0,
+            "x": rng.randrange(0, 3000),
+            "y": rng.randrange(0, 1500),
+            "width": rng.randrange(300, 1900),
+            "height": rng.randrange(200, 1000)
+        }
+    return windows
+
+class FakeWindowCalls(dbus.service.Object):
+    LIST_FIELDS = ["id", "wm_class", "wm_class_instance", "pid", "in_current_workspace", "monitor", "focus", "frame_type", "window_type"]
+
+    def __init__(self, bus: dbus.Bus, windows: dict[int, dict], latency: float, list_titles: bool):
+        super().__init__(bus, OBJECT_PATH)
+        self.windows = windows
+        self.latency_ms = int(latency * 1000)
+        self.list_titles = list_titles
+
+    def _later(self, callback, *args) -> None:
+        if self.latency_ms <= 0:
+            callback(*args)
+            return
+
+        def fire():
+            callback(*args)
+            return False
+        GLib.timeout_add(self.latency_ms, fire)
+
+    def _window(self, winid, error) -> dict:
+        window = self.windows.get(int(winid))
+        if window is None:
+            self._later(error, dbus.exceptions.DBusException("Not found", name="org.gnome.gjs.JSError.Error"))
+        return window
+
+    def _update(self, winid, reply, error, **fields) -> None:
+        window = self._window(winid, error)
+        if window is not None:
+            window.update(fields)
+            self._later(reply)
+
+    @dbus.service.method(INTERFACE, out_signature="s", async_callbacks=("reply", "error"))
+    def List(self, reply, error):
+        fields = self.LIST_FIELDS + (["title"] if self.list_titles else [])
+        self._later(reply, json.dumps([{field: window[field] for field in fields} for window in self.windows.values()]))
+
+    @dbus.service.method(INTERFACE, out_signature="s", async_callbacks=("reply", "error"))
+    def Details(self, winid, reply, error):
+        window = self._window(winid, error)
+        if window is not None:
+            self._later(reply, json.dumps(window))
+
+    @dbus.service.method(INTERFACE, out_signature="s", async_callbacks=("reply", "error"))
+    def GetTitle(self, winid, reply, error):
+        window = self._window(winid, error)
+        if window is not None:
+            self._later(reply, window["title"])
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Move(self, winid, x, y, reply, error):
+        self._update(winid, reply, error, x=int(x), y=int(y))
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Resize(self, winid, width, height, reply, error):
+        self._update(winid, reply, error, width=int(width), height=int(height))
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def MoveResize(self, winid, x, y, width, height, reply, error):
+        self._update(winid, reply, error, x=int(x), y=int(y), width=int(width), height=int(height))
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Maximize(self, winid, reply, error):
+        self._update(winid, reply, error, maximized=3)
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Unmaximize(self, winid, reply, error):
+        self._update(winid, reply, error, maximized=0)
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Minimize(self, winid, reply, error):
+        self._update(winid, reply, error, minimized=True)
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Unminimize(self, winid, reply, error):
+        self._update(winid, reply, error, minimized=False)
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Activate(self, winid, reply, error):
+        window = self._window(winid, error)
+        if window is not None:
+            for other in self.windows.values():
+                other["focus"] = other is window
+            self._later(reply)
+
+    @dbus.service.method(INTERFACE, async_callbacks=("reply", "error"))
+    def Close(self, winid, reply, error):
+        window = self._window(winid, error)
+        if window is not None:
+            del self.windows[window["id"]]
+            self._later(reply)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Fake Window Calls D-Bus service")
+    parser.add_argument("--windows", type=int, default=100)
+    parser.add_argument("--latency-ms", type=float, default=1)
+    parser.add_argument("--list-titles", action="store_true", help="Include titles in List() like newer extension versions")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    DBusGMainLoop(set_as_default=True)
+    bus = dbus.SessionBus()
+    name = dbus.service.BusName(BUS_NAME, bus, do_not_queue=True)
+    service = FakeWindowCalls(bus, generate_windows(args.windows, args.seed), args.latency_ms / 1000, args.list_titles)
+    GLib.MainLoop().run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+# Replays a bus call trace written by WindowManager.start_trace (plugin settings "trace_file" and "trace_responses")
+# and reports the latency per originating operation and method.
+# Modes:
+#   recorded  analyse the trace as it was recorded, no calls are made
+#   mock      replay against a stand-in that answers every call with its recorded response after its recorded latency,
+#             needs a trace written with "trace_responses"
+#   fake      replay against the fake Window Calls service on a private dbus-daemon, like benchmarks.run
+# Calls are issued at their recorded offsets (scaled by --speed) through WindowManager, so the bus worker's
+# ordering and deduplication apply like in the plugin.
+# --folded writes folded stacks ("operation;method microseconds") for flamegraph.pl, inferno or speedscope.
+#
+# Usage (from the plugin root): python -m benchmarks.replay trace.jsonl --mode fake --latency-ms 1 --folded trace.folded
+
+# Import python modules
+import argparse
+import json
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+
+import dbus
+
+# Import internal modules
+from internal.WindowManager import WindowManager
+from benchmarks.run import start_bus, start_service, wait_for_name
+
+def load_trace(path: str) -> list[dict]:
+    entries = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            # Header lines are written whenever a trace gets started
+            if "m" in entry:
+                entries.append(entry)
+    entries.sort(key=lambda entry: entry["s"])
+    return entries
+
+class RecordedInterface:
+    """Answers calls with the responses recorded for the same method and arguments, in recorded order."""
+    def __init__(self, entries: list[dict]):
+        self._responses: dict[tuple, deque] = defaultdict(deque)
+        for entry in entries:
+            self._responses[(entry["m"], *entry["a"])].append(entry)
+        self._lock = threading.Lock()
+
+    def __getattr__(self, method: str):
+        def call(*args, timeout: float = None):
+            with self._lock:
+                responses = self._responses.get((method, *args))
+                if not responses:
+                    raise dbus.exceptions.DBusException(f"No recorded response for {method}{args}", name="org.freedesktop.DBus.Error.Failed")
+                entry = responses[0]
+                responses.rotate(-1)
+            time.sleep(max(entry["e"] - entry["s"], 0))
+            if "err" in entry:
+                raise dbus.exceptions.DBusException("Recorded error", name=entry["err"])
+            return entry.get("r", "")
+        return call
+
+class ReplayWindowManager(WindowManager):
+    """Replays recorded errors without their side effects, a recorded ServiceUnknown must not drop the stand-in interface."""
+    def _on_call_error(self, error: dbus.exceptions.DBusException) -> None:
+        pass
+
+def map_window_ids(entries: list[dict], window_ids: list[int]) -> list[dict]:
+    # Recorded window ids do not exist on the fake service, map them to its windows in order of appearance
+    mapping: dict[str, str] = {}
+    mapped = []
+    for entry in entries:
+        if entry["a"]:
+            recorded_id = str(entry["a"][0])
+            if recorded_id not in mapping:
+                mapping[recorded_id] = str(window_ids[len(mapping) % len(window_ids)])
+            entry = dict(entry, a=[mapping[recorded_id], *entry["a"][1:]])
+        mapped.append(entry)
+    return mapped
+
+def replay(window_manager: WindowManager, entries: list[dict], speed: float) -> list[dict]:
+    # Issues every call at its recorded offset, returns one sample per call
+    samples = []
+    lock = threading.Lock()
+    done = threading.Semaphore(0)
+    first_start = entries[0]["s"]
+    replay_start = time.monotonic()
+
+    for entry in entries:
+        delay = (entry["s"] - first_start) / speed - (time.monotonic() - replay_start)
+        if delay > 0:
+            time.sleep(delay)
+
+        submitted = time.monotonic()
+        future = window_manager._submit_call(entry["m"], *entry["a"], timeout=30)
+
+        def on_done(future, entry=entry, submitted=submitted):
+            with lock:
+                samples.append({
+                    "origin": entry.get("o") or "unknown",
+                    "method": entry["m"],
+                    "duration": time.monotonic() - submitted,
+                    "error": future.exception() is not None
+                })
+            done.release()
+        future.add_done_callback(on_done)
+
+    for _ in entries:
+        done.acquire()
+    return samples
+
+def recorded_samples(entries: list[dict]) -> list[dict]:
+    return [
+        {"origin": entry.get("o") or "unknown", "method": entry["m"], "duration": entry["e"] - entry["s"], "error": "err" in entry}
+        for entry in entries
+    ]
+
+def summarize(durations: list[float], errors: int) -> dict:
+    durations = sorted(durations)
+    return {
+        "calls": len(durations),
+        "errors": errors,
+        "total_ms": sum(durations) * 1000,
+        "mean_ms": statistics.mean(durations) * 1000,
+        "p50_ms": durations[len(durations) // 2] * 1000,
+        "p95_ms": durations[min(int(len(durations) * 0.95), len(durations) - 1)] * 1000,
+        "max_ms": durations[-1] * 1000
+    }
+
+def breakdown(samples: list[dict]) -> dict:
+    by_origin: dict[str, list[dict]] = defaultdict(list)
+    for sample in samples:
+        by_origin[sample["origin"]].append(sample)
+
+    operations = {}
+    for origin, origin_samples in sorted(by_origin.items()):
+        by_method: dict[str, list[dict]] = defaultdict(list)
+        for sample in origin_samples:
+            by_method[sample["method"]].append(sample)
+        operations[origin] = summarize([sample["duration"] for sample in origin_samples], sum(sample["error"] for sample in origin_samples))
+        operations[origin]["methods"] = {
+            method: summarize([sample["duration"] for sample in method_samples], sum(sample["error"] for sample in method_samples))
+            for method, method_samples in sorted(by_method.items())
+        }
+    return operations
+
+def folded_stacks(samples: list[dict]) -> str:
+    totals: dict[str, float] = defaultdict(float)
+    for sample in samples:
+        totals[f"{sample['origin']};dbus.{sample['method']}"] += sample["duration"]
+    return "".join(f"{stack} {max(int(total * 1_000_000), 1)}\n" for stack, total in sorted(totals.items()))
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay and profile a GnomeWindowCalls bus call trace")
+    parser.add_argument("trace", help="Trace file written by WindowManager.start_trace")
+    parser.add_argument("--mode", choices=["recorded", "mock", "fake"], default="recorded")
+    parser.add_argument("--speed", type=float, default=1, help="Replay this many times faster than recorded")
+    parser.add_argument("--windows", type=int, help="Windows on the fake service, default: windows in the trace")
+    parser.add_argument("--latency-ms", type=float, default=1, help="Delay the fake service adds to every reply")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    parser.add_argument("--folded", help="Write folded stacks to this file")
+    args = parser.parse_args()
+
+    entries = load_trace(args.trace)
+    if not entries:
+        parser.error(f"{args.trace} contains no calls")
+
+    start = time.monotonic()
+    if args.mode == "recorded":
+        samples = recorded_samples(entries)
+    elif args.mode == "mock":
+        if not any("r" in entry for entry in entries):
+            parser.error("mock mode needs a trace recorded with trace_responses")
+        window_manager = ReplayWindowManager(None, snapshot_ttl=0, call_timeout=30)
+        window_manager.proxy = window_manager.interface = RecordedInterface(entries)
+        samples = replay(window_manager, entries, args.speed)
+    else:
+        windows = args.windows or max(len({str(entry["a"][0]) for entry in entries if entry["a"]}), 1)
+        daemon, address = start_bus()
+        try:
+            service = start_service(address, windows, args.latency_ms, list_titles=False)
+            try:
+                bus = dbus.bus.BusConnection(address)
+                wait_for_name(bus)
+                window_manager = WindowManager(bus, snapshot_ttl=0, call_timeout=30)
+                window_ids = [window.id for window in window_manager.load_all_windows(max_age=0)]
+                window_manager.stats.reset()
+                samples = replay(window_manager, map_window_ids(entries, window_ids), args.speed)
+                bus.close()
+            finally:
+                service.terminate()
+                service.wait()
+        finally:
+            daemon.terminate()
+            daemon.wait()
+
+    report = {
+        "trace": os.path.abspath(args.trace),
+        "mode": args.mode,
+        "speed": args.speed,
+        "calls": len(entries),
+        "recorded_span_s": entries[-1]["e"] - entries[0]["s"],
+        "replay_s": time.monotonic() - start,
+        "operations": breakdown(samples)
+    }
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.folded:
+        with open(args.folded, "w") as f:
+            f.write(folded_stacks(samples))
+
+if __name__ == "__main__":
+    main()
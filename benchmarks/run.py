@@ -0,0 +1,140 @@
+# Benchmarks WindowManager against the fake Window Calls service on a private dbus-daemon.
+# No GNOME session is needed, only dbus-daemon, dbus-python and PyGObject.
+# Results are written as JSON (stdout or --output).
+#
+# Usage (from the plugin root): python -m benchmarks.run --windows 10 100 1000 --latency-ms 1 --iterations 20
+
+# Import python modules
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+import dbus
+
+# Import internal modules
+from internal.WindowManager import WindowManager
+from internal.MatchSpec import MatchSpec
+from benchmarks.fake_window_calls import BUS_NAME
+
+PLUGIN_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def start_bus() -> tuple[subprocess.Popen, str]:
+    daemon = subprocess.Popen(["dbus-daemon", "--session", "--nofork", "--print-address=1"], stdout=subprocess.PIPE, text=True)
+    address = daemon.stdout.readline().strip()
+    if not address:
+        daemon.kill()
+        raise RuntimeError("dbus-daemon did not report an address")
+    return daemon, address
+
+def start_service(address: str, windows: int, latency_ms: float, list_titles: bool) -> subprocess.Popen:
+    command = [sys.executable, "-m", "benchmarks.fake_window_calls", "--windows", str(windows), "--latency-ms", str(latency_ms)]
+    if list_titles:
+        command.append("--list-titles")
+    return subprocess.Popen(command, cwd=PLUGIN_ROOT, env=dict(os.environ, DBUS_SESSION_BUS_ADDRESS=address))
+
+def wait_for_name(bus: dbus.bus.BusConnection, timeout: float = 10) -> None:
+    deadline = time.monotonic() + timeout
+    while not bus.name_has_owner(BUS_NAME):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{BUS_NAME} did not appear on the bus")
+        time.sleep(0.05)
+
+def measure(window_manager: WindowManager, name: str, windows: int, iterations: int, fn) -> dict:
+    fn()  # Warm up proxies and thread pools
+    window_manager.stats.reset()
+
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - start)
+
+    calls = {method: entry["count"] / iterations for method, entry in window_manager.stats.get_stats().items()}
+    durations.sort()
+    return {
+        "scenario": name,
+        "windows": windows,
+        "iterations": iterations,
+        "mean_ms": statistics.mean(durations) * 1000,
+        "p50_ms": durations[len(durations) // 2] * 1000,
+        "p90_ms": durations[min(int(len(durations) * 0.9), len(durations) - 1)] * 1000,
+        "min_ms": durations[0] * 1000,
+        "max_ms": durations[-1] * 1000,
+        "bus_calls_per_iteration": calls
+    }
+
+def run_scenarios(window_manager: WindowManager, windows: int, iterations: int) -> list[dict]:
+    title_spec = MatchSpec("firefox", "window 1")
+    status_spec = MatchSpec("code", ".*")
+    fan_out_spec = MatchSpec("terminal", ".*")
+
+    def fan_out_sequential():
+        for window_id in window_manager.find_windows_by_spec(fan_out_spec):
+            window_manager.move_resize_window(window_id, 10, 10, 800, 600)
+
+    def fan_out_batch():
+        window_manager.move_resize_many(window_manager.find_windows_by_spec(fan_out_spec), position=(10, 10), size=(800, 600))
+
+    def status_query():
+        window_manager.get_windows_details(window_manager.find_windows_by_spec(status_spec))
+
+    return [
+        measure(window_manager, "find_windows_by_class_and_title", windows, iterations, lambda: window_manager.find_windows_by_class_and_title(title_spec.wm_class, title_spec.title)),
+        measure(window_manager, "get_all_titles", windows, iterations, window_manager.get_all_titles),
+        measure(window_manager, "status_query", windows, iterations, status_query),
+        measure(window_manager, "fan_out_sequential", windows, iterations, fan_out_sequential),
+        measure(window_manager, "fan_out_batch", windows, iterations, fan_out_batch)
+    ]
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GnomeWindowCalls WindowManager benchmarks")
+    parser.add_argument("--windows", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency-ms", type=float, default=1, help="Delay the fake service adds to every reply")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--list-titles", action="store_true", help="Let List() include titles like newer extension versions")
+    parser.add_argument("--output", help="Write the JSON report to this file instead of stdout")
+    args = parser.parse_args()
+
+    with open(os.path.join(PLUGIN_ROOT, "manifest.json")) as f:
+        plugin_version = json.load(f).get("version")
+
+    report = {
+        "plugin_version": plugin_version,
+        "python": platform.python_version(),
+        "latency_ms": args.latency_ms,
+        "list_titles": args.list_titles,
+        "results": []
+    }
+
+    daemon, address = start_bus()
+    try:
+        for windows in args.windows:
+            service = start_service(address, windows, args.latency_ms, args.list_titles)
+            try:
+                bus = dbus.bus.BusConnection(address)
+                wait_for_name(bus)
+                # No snapshot caching, every iteration measures a cold key press
+                window_manager = WindowManager(bus, snapshot_ttl=0, call_timeout=30)
+                report["results"].extend(run_scenarios(window_manager, windows, args.iterations))
+                bus.close()
+            finally:
+                service.terminate()
+                service.wait()
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# Import python modules
+from concurrent.futures import Future, ThreadPoolExecutor
+from loguru import logger as log
+
+class AsyncWindowManager:
+    """
+    Non-blocking front end for WindowManager.
+    Every operation runs on a worker thread and returns a concurrent.futures.Future resolving to the
+    same value the synchronous method would return. timeout limits each D-Bus call of the operation,
+    priority (see BusWorker) applies to its reads.
+    """
+    def __init__(self, window_manager, max_workers: int = 4):
+        self.window_manager = window_manager
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="GnomeWindowCalls-ops")
+
+    def submit(self, fn, *args, timeout: float = None, priority: int = None, **kwargs) -> Future:
+        return self._pool.submit(self._run, fn, timeout, priority, args, kwargs)
+
+    def _run(self, fn, timeout: float, priority: int, args: tuple, kwargs: dict):
+        # Operations submitted during plugin startup wait for the connection instead of doing nothing
+        self.window_manager.wait_until_connected(timeout or self.window_manager.call_timeout)
+        try:
+            with self.window_manager.call_timeout_override(timeout), self.window_manager.call_priority(priority), \
+                    self.window_manager.call_origin(getattr(fn, "__qualname__", None)):
+                return fn(*args, **kwargs)
+        except Exception as e:
+            log.error(f"Window operation {getattr(fn, '__name__', fn)} failed. Error: {e}")
+            raise
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+    ## Queries
+    def get_all_windows(self, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_all_windows, timeout=timeout)
+
+    def get_window_details(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_window_details, id, timeout=timeout)
+
+    def get_windows_details(self, window_ids: list[int], timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_windows_details, window_ids, timeout=timeout)
+
+    def get_windows_info(self, window_ids: list[int], timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_windows_info, window_ids, timeout=timeout)
+
+    def get_title(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_title, id, timeout=timeout)
+
+    def get_titles(self, window_ids: list[int], timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_titles, window_ids, timeout=timeout)
+
+    def get_all_titles(self, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_all_titles, timeout=timeout)
+
+    def get_all_wm_classes(self, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.get_all_wm_classes, timeout=timeout)
+
+    def find_windows_by_class_and_title(self, wm_class_pattern: str, title_pattern: str, timeout: float = None, **filters) -> Future:
+        return self.submit(self.window_manager.find_windows_by_class_and_title, wm_class_pattern, title_pattern, timeout=timeout, **filters)
+
+    def find_windows_by_spec(self, spec, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.find_windows_by_spec, spec, timeout=timeout)
+
+    def find_windows_by_specs(self, specs: list, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.find_windows_by_specs, specs, timeout=timeout)
+
+    def resolve_layout(self, specs: list, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.resolve_layout, specs, timeout=timeout)
+
+    def capture_layout(self, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.capture_layout, timeout=timeout)
+
+    ## Mutations
+    def move_window_to(self, id: int, x: int, y: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.move_window_to, id, x, y, timeout=timeout)
+
+    def move_resize_window(self, id: int, x: int, y: int, width: int, height: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.move_resize_window, id, x, y, width, height, timeout=timeout)
+
+    def resize_window_to(self, id: int, width: int, height: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.resize_window_to, id, width, height, timeout=timeout)
+
+    def move_resize_many(self, window_ids: list[int], position: tuple[int, int] = None, size: tuple[int, int] = None, timeout: float = None, tolerance: int = None) -> Future:
+        # timeout is the deadline of the whole batch here
+        return self.submit(self.window_manager.move_resize_many, window_ids, position, size, timeout, tolerance)
+
+    def apply_geometries(self, geometries: dict[int, dict], timeout: float = None, tolerance: int = None) -> Future:
+        return self.submit(self.window_manager.apply_geometries, geometries, timeout, tolerance)
+
+    def maximize_window(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.maximize_window, id, timeout=timeout)
+
+    def minimize_window(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.minimize_window, id, timeout=timeout)
+
+    def unmaximize_window(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.unmaximize_window, id, timeout=timeout)
+
+    def unminimize_window(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.unminimize_window, id, timeout=timeout)
+
+    def activate_window(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.activate_window, id, timeout=timeout)
+
+    def close_window(self, id: int, timeout: float = None) -> Future:
+        return self.submit(self.window_manager.close_window, id, timeout=timeout)
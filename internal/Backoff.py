@@ -0,0 +1,24 @@
+# Import python modules
+import time
+
+class Backoff:
+    """Exponential delay between retries, reset after a success."""
+    def __init__(self, initial: float = 0.5, maximum: float = 30, factor: float = 2):
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.delay = initial
+        self.next_attempt: float = 0
+
+    def ready(self) -> bool:
+        return time.monotonic() >= self.next_attempt
+
+    def failed(self) -> float:
+        self.next_attempt = time.monotonic() + self.delay
+        delay = self.delay
+        self.delay = min(self.delay * self.factor, self.maximum)
+        return delay
+
+    def reset(self) -> None:
+        self.delay = self.initial
+        self.next_attempt = 0
@@ -0,0 +1,23 @@
+class BatchResult:
+    """Outcome of one operation applied to many windows."""
+    __slots__ = ("succeeded", "failed", "skipped", "duration")
+
+    def __init__(self):
+        self.succeeded: list[int] = []
+        # window id -> error message
+        self.failed: dict[int, str] = {}
+        # Windows that were already in place, no call was sent for them
+        self.skipped: list[int] = []
+        self.duration: float = 0
+
+    def ok(self) -> bool:
+        return not self.failed
+
+    def get_total(self) -> int:
+        return len(self.succeeded) + len(self.failed) + len(self.skipped)
+
+    def get_skipped_count(self) -> int:
+        return len(self.skipped)
+
+    def __repr__(self) -> str:
+        return f"BatchResult(succeeded={len(self.succeeded)}, failed={len(self.failed)}, skipped={len(self.skipped)}, duration={self.duration * 1000:.1f}ms)"
@@ -0,0 +1,128 @@
+# Import python modules
+import heapq
+import itertools
+import threading
+from concurrent.futures import Future
+
+# Lower runs first
+PRIORITY_MUTATION = 0
+PRIORITY_USER = 1
+PRIORITY_BACKGROUND = 2
+
+class BusQueueFull(Exception):
+    pass
+
+class BusWorker:
+    """
+    Runs bus calls on up to max_workers threads, highest priority first and in submission order within a priority.
+    Requests with a key join an identical request that is still queued or running instead of running again;
+    a joining request with a higher priority moves the queued request up.
+    Once max_depth requests are queued, new non-mutation requests fail with BusQueueFull. Mutations are always accepted.
+    """
+    def __init__(self, max_workers: int = 16, max_depth: int = 256, name: str = "GnomeWindowCalls-bus"):
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.name = name
+
+        self._cond = threading.Condition()
+        # Entries are [priority, seq, future, key, fn, args, valid], stale entries are skipped when popped
+        self._heap: list[list] = []
+        self._seq = itertools.count()
+        self._depth = 0
+        # key -> (future, queued entry or None once running)
+        self._in_flight: dict = {}
+        self._threads: list[threading.Thread] = []
+        self._idle = 0
+        self._closed = False
+
+    def submit(self, fn, *args, priority: int = PRIORITY_USER, key=None) -> Future:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BusWorker is shut down")
+
+            if key is not None and key in self._in_flight:
+                future, entry = self._in_flight[key]
+                if entry is not None and priority < entry[0]:
+                    entry[6] = False
+                    entry = [priority, next(self._seq), future, key, fn, args, True]
+                    heapq.heappush(self._heap, entry)
+                    self._in_flight[key] = (future, entry)
+                return future
+
+            future = Future()
+            if self._depth >= self.max_depth and priority != PRIORITY_MUTATION:
+                future.set_exception(BusQueueFull(f"{self._depth} bus calls queued"))
+                return future
+
+            entry = [priority, next(self._seq), future, key, fn, args, True]
+            heapq.heappush(self._heap, entry)
+            self._depth += 1
+            if key is not None:
+                self._in_flight[key] = (future, entry)
+
+            # Idle threads that were notified but did not take the lock yet still count as idle, so compare against
+            # all queued work instead of only starting a thread when none is idle
+            if self._depth > self._idle and len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._run, name=f"{self.name}-{len(self._threads)}", daemon=True)
+                self._threads.append(thread)
+                thread.start()
+            self._cond.notify()
+        return future
+
+    def get_depth(self) -> int:
+        return self._depth
+
+    def shutdown(self) -> None:
+        with self._cond:
+            self._closed = True
+            for entry in self._heap:
+                if entry[6]:
+                    entry[2].cancel()
+            self._heap.clear()
+            self._depth = 0
+            self._in_flight.clear()
+            self._cond.notify_all()
+
+    def _next_entry(self) -> list:
+        # Called with the condition held, returns None once shut down
+        while True:
+            while not self._heap:
+                if self._closed:
+                    return None
+                self._idle += 1
+                self._cond.wait()
+                self._idle -= 1
+            entry = heapq.heappop(self._heap)
+            if entry[6]:
+                self._depth -= 1
+                if entry[3] is not None:
+                    self._in_flight[entry[3]] = (entry[2], None)
+                return entry
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                entry = self._next_entry()
+            if entry is None:
+                return
+            _, _, future, key, fn, args, _ = entry
+
+            if not future.set_running_or_notify_cancel():
+                self._finish(key, future)
+                continue
+            try:
+                result = fn(*args)
+            except BaseException as e:
+                # Requests arriving from now on start a new call instead of joining a finished one
+                self._finish(key, future)
+                future.set_exception(e)
+            else:
+                self._finish(key, future)
+                future.set_result(result)
+
+    def _finish(self, key, future: Future) -> None:
+        if key is None:
+            return
+        with self._cond:
+            if key in self._in_flight and self._in_flight[key][0] is future:
+                del self._in_flight[key]
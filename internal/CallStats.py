@@ -0,0 +1,106 @@
+# Import python modules
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from loguru import logger as log
+
+class LatencyStats:
+    __slots__ = ("count", "errors", "total", "max", "samples")
+
+    def __init__(self, window: int):
+        self.count = 0
+        self.errors = 0
+        self.total: float = 0
+        self.max: float = 0
+        # Percentiles are computed over the most recent samples only
+        self.samples: deque = deque(maxlen=window)
+
+    def add(self, duration: float, error: bool) -> None:
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        self.samples.append(duration)
+        if error:
+            self.errors += 1
+
+    def to_dict(self) -> dict:
+        samples = sorted(self.samples)
+
+        def percentile(p: float) -> float:
+            if not samples:
+                return 0
+            return samples[min(int(len(samples) * p), len(samples) - 1)] * 1000
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total / self.count * 1000 if self.count else 0,
+            "p50_ms": percentile(0.5),
+            "p90_ms": percentile(0.9),
+            "p99_ms": percentile(0.99),
+            "max_ms": self.max * 1000
+        }
+
+class CallStats:
+    """
+    Call counts, error counts and latency percentiles per name.
+    WindowManager records every bus call as "dbus.<Method>", actions record key press to last window update as "action.<Action>".
+    """
+    def __init__(self, window: int = 1024):
+        self.window = window
+        self.entries: dict[str, LatencyStats] = {}
+        self._lock = threading.Lock()
+        self._dump_thread: threading.Thread = None
+        self._dump_stop = threading.Event()
+
+    def record(self, name: str, duration: float, error: bool = False) -> None:
+        with self._lock:
+            entry = self.entries.get(name)
+            if entry is None:
+                entry = self.entries[name] = LatencyStats(self.window)
+            entry.add(duration, error)
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        error = False
+        try:
+            yield
+        except Exception:
+            error = True
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, error)
+
+    def get_stats(self) -> dict[str, dict]:
+        with self._lock:
+            return {name: entry.to_dict() for name, entry in sorted(self.entries.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.entries.clear()
+
+    def start_periodic_dump(self, interval: float) -> None:
+        if interval <= 0 or self._dump_thread is not None:
+            return
+        self._dump_stop.clear()
+        self._dump_thread = threading.Thread(target=self._dump_loop, args=(interval,), name="GnomeWindowCalls-stats", daemon=True)
+        self._dump_thread.start()
+
+    def stop_periodic_dump(self) -> None:
+        self._dump_stop.set()
+        self._dump_thread = None
+
+    def _dump_loop(self, interval: float) -> None:
+        while not self._dump_stop.wait(interval):
+            self.dump()
+
+    def dump(self) -> None:
+        stats = self.get_stats()
+        if not stats:
+            return
+        log.bind(window_calls_stats=stats).info("GnomeWindowCalls stats: " + ", ".join(
+            f"{name} n={entry['count']} err={entry['errors']} p50={entry['p50_ms']:.1f}ms p99={entry['p99_ms']:.1f}ms"
+            for name, entry in stats.items()
+        ))
@@ -0,0 +1,65 @@
+# Import python modules
+import threading
+import time
+
+# Import internal modules
+from .Backoff import Backoff
+
+class CircuitBreaker:
+    """
+    Fails calls fast after failure_threshold consecutive failures.
+    Once the cooldown has passed, one probe is let through: the thread that got it may make calls, every other
+    caller still fails fast until the probe succeeds (closed) or fails (open with a longer cooldown).
+    A probe that reports neither within probe_timeout seconds is given to the next caller.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 5, max_reset_timeout: float = 60, probe_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.cooldown = Backoff(initial=reset_timeout, maximum=max_reset_timeout)
+        self.probe_timeout = probe_timeout
+        self.failures = 0
+        self.state = self.CLOSED
+        self._probe_thread: int = None
+        self._probe_started: float = 0
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if not self.cooldown.ready():
+                    return False
+                self.state = self.HALF_OPEN
+                self._probe_thread = None
+
+            # Half open, nested checks of the probing thread pass as well
+            thread = threading.get_ident()
+            if self._probe_thread == thread:
+                return True
+            if self._probe_thread is None or time.monotonic() - self._probe_started > self.probe_timeout:
+                self._probe_thread = thread
+                self._probe_started = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._probe_thread = None
+            self.cooldown.reset()
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._probe_thread = None
+                self.cooldown.failed()
+
+    def is_open(self) -> bool:
+        return self.state == self.OPEN
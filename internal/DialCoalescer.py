@@ -0,0 +1,121 @@
+# Import python modules
+import threading
+import time
+from loguru import logger as log
+
+# Import internal modules
+from .MatchSpec import MatchSpec
+
+GEOMETRY_FIELDS = ("x", "y", "width", "height")
+# Locale keys of the fields a dial can adjust
+DIAL_AXIS_LABELS = {
+    "x": "actions.x_position.title",
+    "y": "actions.y_position.title",
+    "width": "actions.width.title",
+    "height": "actions.height.title"
+}
+
+class DialCoalescer:
+    """
+    Turns dial ticks into relative geometry changes of the matching windows.
+    Ticks arriving while a batch is in flight or within one frame are summed up and sent as a single batch.
+    The matched windows and their geometry are looked up once per rotation and then tracked locally;
+    a rotation ends after cache_timeout seconds without ticks.
+    """
+    def __init__(self, window_manager, frame_interval: float = 1 / 60, cache_timeout: float = 0.5):
+        self.window_manager = window_manager
+        self.frame_interval = frame_interval
+        self.cache_timeout = cache_timeout
+
+        self._lock = threading.Lock()
+        self._spec: MatchSpec = None
+        self._steps: dict[str, int] = {}
+        self._pending_ticks = 0
+        self._last_turn: float = 0
+        self._last_flush: float = 0
+        self._flush_scheduled = False
+        # window id -> last known {"x", "y", "width", "height"}
+        self._geometry: dict[int, dict] = None
+        self._rotation = 0
+
+    def turn(self, spec: MatchSpec, ticks: int, steps: dict[str, int]) -> None:
+        # steps maps the geometry fields to change to the pixels per tick, e.g. {"x": 10}
+        if not spec.is_valid() or not steps:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if spec is not self._spec or now - self._last_turn > self.cache_timeout:
+                self._geometry = None
+                self._rotation += 1
+            self._spec = spec
+            self._steps = steps
+            self._pending_ticks += ticks
+            self._last_turn = now
+
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+            delay = max(self._last_flush + self.frame_interval - now, 0)
+        self._schedule(delay)
+
+    def _schedule(self, delay: float) -> None:
+        timer = threading.Timer(delay, self._flush)
+        timer.daemon = True
+        timer.start()
+
+    def _flush(self) -> None:
+        with self._lock:
+            ticks = self._pending_ticks
+            self._pending_ticks = 0
+            spec, steps, geometry, rotation = self._spec, self._steps, self._geometry, self._rotation
+
+        try:
+            if ticks != 0:
+                with self.window_manager.call_origin("DialCoalescer.flush"):
+                    if geometry is None:
+                        geometry = self._load_geometry(spec)
+                    targets = self._apply_ticks(geometry, ticks, steps)
+                    result = self.window_manager.apply_geometries(targets)
+                # Failed windows keep their last applied geometry, the next ticks start from there
+                geometry.update({window_id: {**geometry[window_id], **targets[window_id]} for window_id in result.succeeded})
+        except Exception as e:
+            log.error(f"Failed to apply dial turn. Error: {e}")
+
+        with self._lock:
+            self._last_flush = time.monotonic()
+            # Keep the cache unless a new rotation started while this batch was in flight
+            if self._rotation == rotation:
+                self._geometry = geometry
+            if self._pending_ticks == 0:
+                self._flush_scheduled = False
+                return
+            delay = max(self._last_flush + self.frame_interval - time.monotonic(), 0)
+        self._schedule(delay)
+
+    def _load_geometry(self, spec: MatchSpec) -> dict[int, dict]:
+        window_ids = self.window_manager.find_windows_by_spec(spec)
+        details = self.window_manager.get_windows_details(window_ids)
+        geometry = {}
+        for window_id, window_details in details.items():
+            if window_details.has_geometry():
+                geometry[window_id] = {field: getattr(window_details, field) for field in GEOMETRY_FIELDS}
+        return geometry
+
+    @staticmethod
+    def _apply_ticks(geometry: dict[int, dict], ticks: int, steps: dict[str, int]) -> dict[int, dict]:
+        # Only send the pairs that change, so a pure move stays a Move call
+        fields = set()
+        if "x" in steps or "y" in steps:
+            fields.update(("x", "y"))
+        if "width" in steps or "height" in steps:
+            fields.update(("width", "height"))
+
+        targets = {}
+        for window_id, current in geometry.items():
+            target = {field: current[field] for field in fields}
+            for field, step in steps.items():
+                target[field] = current[field] + ticks * step
+                if field in ("width", "height"):
+                    target[field] = max(target[field], 1)
+            targets[window_id] = target
+        return targets
@@ -0,0 +1,103 @@
+# Import python modules
+import threading
+import time
+import weakref
+from loguru import logger as log
+
+# Import internal modules
+from .MatchSpec import MatchSpec
+from .BusWorker import PRIORITY_BACKGROUND
+
+class MatchRegistry:
+    """
+    Match specs of all loaded actions, resolved together in one pass over the window list.
+    Resolution runs when actions register (page load) and whenever the window set changes, so a key press
+    only has to look up its precomputed window ids. Results are only used while the window generation they
+    were computed for is still current, otherwise lookups fall back to WindowManager. A title change alone does
+    not change the generation, so results of specs with a title pattern also expire after the title max age.
+    """
+    def __init__(self, window_manager, resolve_delay: float = 0.05):
+        self.window_manager = window_manager
+        # Bursts of registrations and window events within resolve_delay seconds cause one pass
+        self.resolve_delay = resolve_delay
+
+        # action -> its specs; actions that get garbage collected drop out on their own
+        self._owners: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._results: dict[MatchSpec, list[int]] = {}
+        self._generation = None
+        self._resolved_at: float = 0
+        self._lock = threading.Lock()
+        self._timer: threading.Timer = None
+
+    def register(self, owner, specs: list[MatchSpec]) -> None:
+        with self._lock:
+            self._owners[owner] = [spec for spec in specs if spec is not None and spec.is_valid()]
+        self.request_resolve()
+
+    def unregister(self, owner) -> None:
+        with self._lock:
+            self._owners.pop(owner, None)
+
+    def on_window_event(self, event: str, window_id: int, window) -> None:
+        self.request_resolve()
+
+    def request_resolve(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.resolve_delay, self._run_resolve)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _run_resolve(self) -> None:
+        with self._lock:
+            self._timer = None
+        try:
+            with self.window_manager.call_priority(PRIORITY_BACKGROUND), self.window_manager.call_origin("MatchRegistry.resolve"):
+                self.resolve()
+        except Exception as e:
+            log.error(f"Failed to resolve window matches. Error: {e}")
+
+    def _get_generation(self):
+        tracker = self.window_manager.tracker
+        if tracker is not None and tracker.is_fresh():
+            return ("tracker", tracker.generation)
+        return ("snapshot", self.window_manager.generation)
+
+    def resolve(self) -> None:
+        if not self.window_manager.get_is_connected():
+            return
+        with self._lock:
+            specs = list({spec: None for owner_specs in self._owners.values() for spec in owner_specs})
+        if not specs:
+            return
+
+        generation = self._get_generation()
+        resolved_at = time.monotonic()
+        matches = self.window_manager.find_windows_by_specs(specs)
+        with self._lock:
+            self._results = dict(zip(specs, matches))
+            self._generation = generation
+            self._resolved_at = resolved_at
+
+    def get_window_ids(self, spec: MatchSpec) -> list[int]:
+        # Precomputed window ids, or None if the spec is unknown or the result is outdated
+        with self._lock:
+            if self._generation != self._get_generation():
+                return None
+            if not spec.matches_all_titles() and time.monotonic() - self._resolved_at > self.window_manager.title_max_age:
+                return None
+            window_ids = self._results.get(spec)
+        return None if window_ids is None else list(window_ids)
+
+    def find_windows(self, spec: MatchSpec) -> list[int]:
+        window_ids = self.get_window_ids(spec)
+        if window_ids is not None:
+            return window_ids
+        return self.window_manager.find_windows_by_spec(spec)
+
+    def find_windows_many(self, specs: list[MatchSpec]) -> list[list[int]]:
+        results = [self.get_window_ids(spec) for spec in specs]
+        if None not in results:
+            return results
+        return self.window_manager.find_windows_by_specs(specs)
@@ -0,0 +1,120 @@
+# Import python modules
+import re
+from loguru import logger as log
+
+# Patterns that match every string, no title lookup is needed for them
+MATCH_ALL_PATTERNS = ("", ".*")
+
+class MatchSpec:
+    """Precompiled window match of an action: regex pair, window filters plus target geometry."""
+    __slots__ = ("wm_class", "title", "wm_class_regex", "title_regex", "wm_class_error", "title_error", "position", "size", "tolerance",
+                 "current_workspace", "monitor", "focused", "skip_minimized")
+
+    def __init__(self, wm_class: str, title: str, position: tuple[int, int] = None, size: tuple[int, int] = None, tolerance: int = 0,
+                 current_workspace: bool = False, monitor: int = None, focused: bool = False, skip_minimized: bool = False):
+        self.wm_class = wm_class
+        self.title = title
+        self.position = position
+        self.size = size
+        # Windows within this many pixels of the target count as in place and are skipped
+        self.tolerance = tolerance
+
+        # Filters on window fields, checked before any title lookup. monitor None means any monitor.
+        # List() reports in_current_workspace and focus, monitor and minimized usually come from Details().
+        self.current_workspace = current_workspace
+        self.monitor = monitor
+        self.focused = focused
+        self.skip_minimized = skip_minimized
+
+        self.wm_class_regex, self.wm_class_error = self._compile(wm_class)
+        self.title_regex, self.title_error = self._compile(title)
+
+    @classmethod
+    def from_settings(cls, settings: dict) -> "MatchSpec":
+        position = settings.get("position", {})
+        size = settings.get("size", {})
+        filters = settings.get("filters", {})
+        monitor = filters.get("monitor", -1)
+
+        x, y = position.get("x"), position.get("y")
+        width, height = size.get("width"), size.get("height")
+
+        return cls(
+            wm_class=settings.get("wm_class", ".*"),
+            title=settings.get("title", ".*"),
+            position=None if None in [x, y] else (int(x), int(y)),
+            size=None if None in [width, height] else (int(width), int(height)),
+            tolerance=int(settings.get("tolerance", 0)),
+            current_workspace=bool(filters.get("current_workspace", False)),
+            monitor=None if monitor is None or int(monitor) < 0 else int(monitor),
+            focused=bool(filters.get("focused", False)),
+            skip_minimized=bool(filters.get("skip_minimized", False))
+        )
+
+    @staticmethod
+    def _compile(pattern: str) -> tuple[re.Pattern, str]:
+        if pattern is None:
+            return None, "missing pattern"
+        try:
+            return re.compile(pattern, re.IGNORECASE), None
+        except re.error as e:
+            log.warning(f"Invalid window regex {pattern!r}: {e}")
+            return None, str(e)
+
+    def is_valid(self) -> bool:
+        return None not in [self.wm_class_regex, self.title_regex]
+
+    def get_geometry(self) -> dict:
+        # Target geometry in the form WindowManager.apply_geometries expects
+        geometry = {}
+        if self.position is not None:
+            geometry["x"], geometry["y"] = self.position
+        if self.size is not None:
+            geometry["width"], geometry["height"] = self.size
+        return geometry
+
+    def matches_all_titles(self) -> bool:
+        return self.title in MATCH_ALL_PATTERNS
+
+    def get_filter_fields(self) -> list[str]:
+        # WindowInfo fields the enabled filters read
+        fields = []
+        if self.current_workspace:
+            fields.append("in_current_workspace")
+        if self.monitor is not None:
+            fields.append("monitor")
+        if self.focused:
+            fields.append("focus")
+        if self.skip_minimized:
+            fields.append("minimized")
+        return fields
+
+    def needs_details(self, window) -> bool:
+        # Whether an enabled filter reads a field the window record does not have, see WindowManager.fill_filter_fields
+        return any(getattr(window, field) is None for field in self.get_filter_fields())
+
+    def match_filters(self, window) -> bool:
+        # window is a WindowInfo. Fields the extension reports neither in List() nor in Details() (None) never exclude a window.
+        if self.current_workspace and window.in_current_workspace is False:
+            return False
+        if self.monitor is not None and window.monitor is not None and window.monitor != self.monitor:
+            return False
+        if self.focused and window.focus is False:
+            return False
+        if self.skip_minimized and window.minimized is True:
+            return False
+        return True
+
+    def match_window(self, window) -> bool:
+        # Everything except the title, which may need an extra lookup
+        return self.is_valid() and self.match_filters(window) and self.match_class(window.wm_class)
+
+    def match_class(self, wm_class: str) -> bool:
+        if wm_class is None or self.wm_class_regex is None:
+            return False
+        return self.wm_class_regex.search(wm_class) is not None
+
+    def match_title(self, title: str) -> bool:
+        if title is None or self.title_regex is None:
+            return False
+        return self.title_regex.search(title) is not None
@@ -0,0 +1,64 @@
+# Import python modules
+import re
+
+# Import gtk modules - used for the suggestion popovers
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Gtk, Adw, Pango
+
+class MatchSuggestions:
+    """
+    Autocomplete for the wm_class and title regex rows of an action, plus a live count of the matching windows.
+    Everything is answered from the SuggestionIndex, typing never causes a bus call.
+    """
+    # Entry text that is a plain value, optionally anchored and escaped, can be completed
+    LITERAL_PATTERN = re.compile(r"^\^?((?:[^\\.^$*+?{}\[\]|()]|\\.)*)\$?$")
+
+    def __init__(self, index, lm, wm_row: Adw.EntryRow, title_row: Adw.EntryRow, get_spec, limit: int = 8):
+        self.index = index
+        self.lm = lm
+        # Returns the current MatchSpec of the rows
+        self.get_spec = get_spec
+        self.limit = limit
+
+        self.count_label = Gtk.Label(css_classes=["dim-label"], valign=Gtk.Align.CENTER)
+        title_row.add_suffix(self.count_label)
+        self._attach("wm_class", wm_row)
+        self._attach("title", title_row)
+        self.update_count()
+
+    def _attach(self, field: str, row: Adw.EntryRow) -> None:
+        list_box = Gtk.ListBox(selection_mode=Gtk.SelectionMode.NONE, css_classes=["navigation-sidebar"])
+        popover = Gtk.Popover(child=list_box)
+        button = Gtk.MenuButton(icon_name="edit-find-symbolic", popover=popover, valign=Gtk.Align.CENTER, css_classes=["flat"],
+                                tooltip_text=self.lm.get("actions.suggestions.tooltip"))
+        row.add_suffix(button)
+
+        popover.connect("show", self.on_popover_show, field, row, list_box)
+        list_box.connect("row-activated", self.on_suggestion_activated, row, popover)
+
+    def on_popover_show(self, popover: Gtk.Popover, field: str, row: Adw.EntryRow, list_box: Gtk.ListBox) -> None:
+        list_box.remove_all()
+        match = self.LITERAL_PATTERN.match(row.get_text())
+        query = re.sub(r"\\(.)", r"\1", match.group(1)) if match else ""
+        suggestions = self.index.suggest(field, query, self.limit)
+        if not suggestions and query:
+            suggestions = self.index.suggest(field, "", self.limit)
+        for value in suggestions:
+            label = Gtk.Label(label=value, xalign=0, ellipsize=Pango.EllipsizeMode.END, max_width_chars=40)
+            list_box_row = Gtk.ListBoxRow(child=label)
+            list_box_row.value = value
+            list_box.append(list_box_row)
+
+    def on_suggestion_activated(self, list_box: Gtk.ListBox, list_box_row: Gtk.ListBoxRow, row: Adw.EntryRow, popover: Gtk.Popover) -> None:
+        popover.popdown()
+        row.set_text(f"^{re.escape(list_box_row.value)}$")
+
+    def update_count(self) -> None:
+        # Nothing to count before the window index got filled
+        if self.index.is_empty():
+            self.count_label.set_label("")
+            return
+        count = self.index.count_matches(self.get_spec())
+        self.count_label.set_label(self.lm.get("actions.suggestions.match_count").format(count=count))
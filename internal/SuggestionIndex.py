@@ -0,0 +1,91 @@
+# Import python modules
+import bisect
+import threading
+
+# Import internal modules
+from .MatchSpec import MatchSpec
+from .WindowInfo import WindowInfo
+
+FIELDS = ("wm_class", "title")
+
+class SuggestionIndex:
+    """
+    Sorted vocabulary of the wm_class and title values of the current windows, for autocomplete in the config rows.
+    Kept up to date from WindowTracker events, so lookups and match counts never need a bus call.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._windows: dict[int, WindowInfo] = {}
+        # field -> value -> number of windows with it
+        self._counts: dict[str, dict[str, int]] = {field: {} for field in FIELDS}
+        # field -> sorted [(lowercase value, value)]
+        self._sorted: dict[str, list[tuple[str, str]]] = {field: [] for field in FIELDS}
+
+    def rebuild(self, windows: list[WindowInfo]) -> None:
+        with self._lock:
+            self._windows.clear()
+            for field in FIELDS:
+                self._counts[field].clear()
+                self._sorted[field].clear()
+            for window in windows:
+                self._add(window)
+
+    def on_window_event(self, event: str, window_id: int, window: WindowInfo) -> None:
+        with self._lock:
+            self._remove(window_id)
+            if event != "removed":
+                self._add(window)
+
+    def _add(self, window: WindowInfo) -> None:
+        self._windows[window.id] = window
+        for field in FIELDS:
+            value = getattr(window, field)
+            if not value:
+                continue
+            counts = self._counts[field]
+            if value not in counts:
+                bisect.insort(self._sorted[field], (value.lower(), value))
+            counts[value] = counts.get(value, 0) + 1
+
+    def _remove(self, window_id: int) -> None:
+        window = self._windows.pop(window_id, None)
+        if window is None:
+            return
+        for field in FIELDS:
+            value = getattr(window, field)
+            if not value:
+                continue
+            counts = self._counts[field]
+            counts[value] -= 1
+            if counts[value] == 0:
+                del counts[value]
+                entries = self._sorted[field]
+                entries.pop(bisect.bisect_left(entries, (value.lower(), value)))
+
+    def is_empty(self) -> bool:
+        return not self._windows
+
+    def suggest(self, field: str, text: str, limit: int = 8) -> list[str]:
+        # Values starting with text first, then values containing it, case insensitive
+        query = text.lower()
+        with self._lock:
+            entries = self._sorted[field]
+            suggestions = []
+            for lower, value in entries[bisect.bisect_left(entries, (query,)):]:
+                if not lower.startswith(query) or len(suggestions) >= limit:
+                    break
+                suggestions.append(value)
+            if len(suggestions) < limit and query:
+                for lower, value in entries:
+                    if query in lower and not lower.startswith(query):
+                        suggestions.append(value)
+                        if len(suggestions) >= limit:
+                            break
+        return suggestions
+
+    def count_matches(self, spec: MatchSpec) -> int:
+        if spec is None or not spec.is_valid():
+            return 0
+        with self._lock:
+            windows = list(self._windows.values())
+        return sum(1 for window in windows if spec.match_window(window) and (spec.matches_all_titles() or spec.match_title(window.title)))
@@ -0,0 +1,56 @@
+# Import python modules
+import json
+import os
+import threading
+import time
+from loguru import logger as log
+
+class TraceRecorder:
+    """
+    Appends one JSON line per bus call to a trace file, for offline analysis with benchmarks/replay.py.
+    Keys: m method, a arguments, s/e start and end (epoch seconds), n response size, o originating operation,
+    err D-Bus error name if the call failed, r the raw response if record_responses is set.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, record_responses: bool = False):
+        self.path = path
+        self.record_responses = record_responses
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, "a", buffering=1)
+        self._write({"trace": self.VERSION, "started": time.time(), "pid": os.getpid()})
+
+    def record(self, method: str, args: tuple, origin: str, start: float, end: float, result=None, error: str = None) -> None:
+        entry = {
+            "m": method,
+            "a": [arg if isinstance(arg, (int, float)) else str(arg) for arg in args],
+            "s": round(start, 6),
+            "e": round(end, 6),
+            "n": len(result) if isinstance(result, str) else 0,
+            "o": origin
+        }
+        if error is not None:
+            entry["err"] = error
+        elif self.record_responses and isinstance(result, str):
+            entry["r"] = result
+        self._write(entry)
+
+    def _write(self, entry: dict) -> None:
+        line = json.dumps(entry, separators=(",", ":"))
+        with self._lock:
+            if self._file is None:
+                return
+            try:
+                self._file.write(line + "\n")
+            except Exception as e:
+                log.error(f"Failed to write trace, stopping it. Error: {e}")
+                self._file.close()
+                self._file = None
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
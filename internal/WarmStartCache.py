@@ -0,0 +1,109 @@
+# Import python modules
+import json
+import os
+import threading
+import time
+from loguru import logger as log
+
+# Import internal modules
+from .WindowInfo import WindowInfo
+
+class WarmStartCache:
+    """
+    On-disk state from the previous run: whether the extension is installed and the last window index.
+    Both are only used optimistically to speed up startup and get revalidated in the background.
+    Entries from another cache version or older than their max age are ignored.
+    """
+    VERSION = 1
+
+    def __init__(self, path: str, extension_max_age: float = 7 * 24 * 3600, windows_max_age: float = 24 * 3600, save_delay: float = 5):
+        self.path = path
+        self.extension_max_age = extension_max_age
+        self.windows_max_age = windows_max_age
+        # Window changes within save_delay seconds are written together
+        self.save_delay = save_delay
+
+        self.data: dict = {}
+        self._tracker = None
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._timer: threading.Timer = None
+
+    def load(self) -> None:
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            log.warning(f"Ignoring unreadable warm start cache {self.path}. Error: {e}")
+            return
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            log.info("Ignoring warm start cache from another version")
+            return
+        with self._lock:
+            self.data = data
+
+    def _get_entry(self, name: str, max_age: float) -> dict:
+        entry = self.data.get(name)
+        if not isinstance(entry, dict) or not isinstance(entry.get("saved_at"), (int, float)):
+            return None
+        if time.time() - entry["saved_at"] > max_age:
+            return None
+        return entry
+
+    def get_extension_installed(self, uuid: str) -> bool:
+        # None if unknown or outdated
+        entry = self._get_entry("extension", self.extension_max_age)
+        if entry is None or entry.get("uuid") != uuid:
+            return None
+        return bool(entry.get("installed"))
+
+    def set_extension_installed(self, uuid: str, installed: bool) -> None:
+        with self._lock:
+            self.data["extension"] = {"uuid": uuid, "installed": installed, "saved_at": time.time()}
+        self.save()
+
+    def get_windows(self) -> list[WindowInfo]:
+        entry = self._get_entry("windows", self.windows_max_age)
+        if entry is None or not isinstance(entry.get("entries"), list):
+            return []
+        windows = [WindowInfo.parse(window) for window in entry["entries"]]
+        return [window for window in windows if window is not None]
+
+    def set_windows(self, windows: list[WindowInfo]) -> None:
+        with self._lock:
+            self.data["windows"] = {"entries": [window.to_dict() for window in windows], "saved_at": time.time()}
+
+    def track(self, tracker) -> None:
+        # Keep the stored windows in sync with the tracker's index
+        self._tracker = tracker
+        tracker.add_listener(self.on_window_event)
+
+    def on_window_event(self, event: str, window_id: int, window: WindowInfo) -> None:
+        with self._lock:
+            if self._timer is not None:
+                return
+            self._timer = threading.Timer(self.save_delay, self._save_tracked)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _save_tracked(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.set_windows(self._tracker.get_windows())
+        self.save()
+
+    def save(self) -> None:
+        with self._lock:
+            data = dict(self.data, version=self.VERSION)
+        with self._save_lock:
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                # Write to a temporary file first, so a crash never leaves a truncated cache behind
+                temp_path = f"{self.path}.tmp"
+                with open(temp_path, "w") as f:
+                    json.dump(data, f)
+                os.replace(temp_path, self.path)
+            except Exception as e:
+                log.error(f"Failed to save warm start cache. Error: {e}")
@@ -0,0 +1,189 @@
+# Import python modules
+import threading
+import time
+from concurrent.futures import Future
+from loguru import logger as log
+
+# Import gtk modules - used for the frame tick
+from gi.repository import GLib
+
+GEOMETRY_FIELDS = ("x", "y", "width", "height")
+
+EASINGS = {
+    "linear": lambda t: t,
+    "ease_in": lambda t: t ** 3,
+    "ease_out": lambda t: 1 - (1 - t) ** 3,
+    "ease_in_out": lambda t: 4 * t ** 3 if t < 0.5 else 1 - (-2 * t + 2) ** 3 / 2
+}
+
+class WindowAnimation:
+    __slots__ = ("start_geometry", "target", "start_time", "duration", "easing", "failures")
+
+    def __init__(self, start_geometry: dict, target: dict, duration: float, easing: str):
+        self.start_geometry = start_geometry
+        self.target = target
+        self.start_time = time.monotonic()
+        self.duration = duration
+        self.easing = EASINGS.get(easing, EASINGS["ease_in_out"])
+        # Failed frames in a row, the window probably went away once this passes WindowAnimator.max_failures
+        self.failures = 0
+
+    def get_geometry(self, now: float) -> tuple[dict, bool]:
+        # Geometry at time now and whether the animation is done. The last frame is always the exact target.
+        progress = 1 if self.duration <= 0 else min((now - self.start_time) / self.duration, 1)
+        if progress >= 1:
+            return self.target, True
+        eased = self.easing(progress)
+        return {
+            field: round(self.start_geometry[field] + (self.target[field] - self.start_geometry[field]) * eased)
+            for field in self.target
+        }, False
+
+class WindowAnimator:
+    """
+    Animates window geometry changes, all running animations share one GLib frame tick.
+    Every frame sends at most one call per window as one batch. While a batch is still in flight the next
+    frames are dropped, and the frame interval follows the observed batch round-trip time, so a slow shell
+    gets fewer, larger steps instead of a growing queue. An animation only ends once its exact target was applied;
+    windows whose frame failed get the geometry of the next frame sent again, up to max_failures times in a row.
+    """
+    def __init__(self, async_window_manager, min_interval: float = 1 / 60, max_interval: float = 0.25, max_failures: int = 3):
+        self.async_window_manager = async_window_manager
+        self.window_manager = async_window_manager.window_manager
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.max_failures = max_failures
+
+        self._lock = threading.Lock()
+        # window id -> running animation
+        self._animations: dict[int, WindowAnimation] = {}
+        # window id -> geometry last sent for it, dropped again if that frame failed
+        self._sent: dict[int, dict] = {}
+        self._in_flight: Future = None
+        self._interval = min_interval
+        self._round_trip: float = None
+        self._source_id: int = None
+        self._source_interval = min_interval
+
+    def animate_windows(self, window_ids: list[int], target: dict, duration: float, easing: str = "ease_in_out", tolerance: int = None) -> None:
+        # Looks up the start geometry first, which blocks. Call this from a worker thread.
+        if not target:
+            return
+        if tolerance is not None:
+            window_ids = [window_id for window_id in window_ids if not self.window_manager.is_in_place(window_id, target, tolerance)]
+        self.animate(self.load_start_geometries(window_ids), target, duration, easing)
+
+    def load_start_geometries(self, window_ids: list[int]) -> dict[int, dict]:
+        # Running animations continue from where they are, otherwise recent known geometry or Details()
+        geometries = {}
+        missing = []
+        with self._lock:
+            for window_id in window_ids:
+                if window_id in self._sent:
+                    geometries[window_id] = self._sent[window_id]
+                    continue
+                known = self.window_manager.get_known_geometry(window_id)
+                if known is not None and all(field in known for field in GEOMETRY_FIELDS) and not known.get("maximized"):
+                    geometries[window_id] = known
+                else:
+                    missing.append(window_id)
+        for window_id, details in self.window_manager.get_windows_details(missing).items():
+            if details.has_geometry():
+                geometries[window_id] = details.get_geometry()
+        return geometries
+
+    def animate(self, start_geometries: dict[int, dict], target: dict, duration: float, easing: str = "ease_in_out") -> None:
+        # Thread safe. Replaces running animations of the same windows.
+        if not start_geometries:
+            return
+        with self._lock:
+            for window_id, start_geometry in start_geometries.items():
+                start = {field: start_geometry.get(field, value) for field, value in target.items()}
+                self._animations[window_id] = WindowAnimation(start, target, duration, easing)
+        GLib.idle_add(self._ensure_tick)
+
+    def is_animating(self) -> bool:
+        with self._lock:
+            return bool(self._animations)
+
+    def _ensure_tick(self) -> bool:
+        if self._source_id is None:
+            self._source_interval = self._interval
+            self._source_id = GLib.timeout_add(max(int(self._interval * 1000), 1), self._tick)
+        return False
+
+    def _tick(self) -> bool:
+        future = None
+        with self._lock:
+            if not self._animations:
+                self._source_id = None
+                return False
+            # Drop this frame, the position is time based so the next one catches up
+            if self._in_flight is not None:
+                return True
+
+            now = time.monotonic()
+            frame = {}
+            animations = {}
+            finished = []
+            for window_id, animation in self._animations.items():
+                geometry, done = animation.get_geometry(now)
+                if geometry != self._sent.get(window_id):
+                    frame[window_id] = geometry
+                    animations[window_id] = animation
+                elif done:
+                    # The target was sent and nothing in flight dropped it again, so it got applied
+                    finished.append(window_id)
+            for window_id in finished:
+                del self._animations[window_id]
+                self._sent.pop(window_id, None)
+
+            if frame:
+                self._sent.update(frame)
+                sent_at = time.monotonic()
+                future = self._in_flight = self.async_window_manager.apply_geometries(frame)
+
+            interval = self._interval
+            running = bool(self._animations)
+            if not running:
+                self._source_id = None
+
+        # Outside the lock, the callback runs right away if the batch already finished
+        if future is not None:
+            future.add_done_callback(lambda future: self._on_frame_done(future, sent_at, animations))
+        return self._reschedule(interval) if running else False
+
+    def _on_frame_done(self, future: Future, sent_at: float, animations: dict[int, WindowAnimation]) -> None:
+        round_trip = time.monotonic() - sent_at
+        if future.cancelled() or future.exception() is not None:
+            log.debug("Animation frame failed")
+            failed = set(animations)
+        else:
+            # apply_geometries reports failed windows in its result instead of raising
+            failed = set(future.result().failed)
+        with self._lock:
+            self._in_flight = None
+            for window_id, animation in animations.items():
+                # The animation may have been replaced meanwhile, the new one sends its own frames
+                if self._animations.get(window_id) is not animation:
+                    continue
+                if window_id not in failed:
+                    animation.failures = 0
+                    continue
+                # Send again on the next tick
+                self._sent.pop(window_id, None)
+                animation.failures += 1
+                if animation.failures > self.max_failures:
+                    log.warning(f"Giving up animating window {window_id} after {animation.failures} failed frames")
+                    del self._animations[window_id]
+            # Smoothed round-trip time, the frame interval never goes below it
+            self._round_trip = round_trip if self._round_trip is None else self._round_trip * 0.8 + round_trip * 0.2
+            self._interval = min(max(self._round_trip, self.min_interval), self.max_interval)
+
+    def _reschedule(self, interval: float) -> bool:
+        # Keep the current timeout unless the frame interval changed by more than a millisecond
+        if abs(self._source_interval - interval) <= 0.001:
+            return True
+        self._source_interval = interval
+        self._source_id = GLib.timeout_add(max(int(interval * 1000), 1), self._tick)
+        return False
@@ -0,0 +1,127 @@
+# Import python modules
+import json
+from loguru import logger as log
+
+# Use a faster decoder when one is installed
+try:
+    import orjson
+
+    def loads(raw):
+        # orjson only accepts exact str, dbus-python replies are dbus.String
+        return orjson.loads(raw if type(raw) in (str, bytes) else str(raw))
+except ImportError:
+    loads = json.loads
+
+STRING_FIELDS = ("wm_class", "wm_class_instance", "title")
+INT_FIELDS = ("pid", "monitor", "maximized", "x", "y", "width", "height")
+BOOL_FIELDS = ("in_current_workspace", "focus", "minimized")
+GEOMETRY_FIELDS = ("x", "y", "width", "height")
+
+class WindowInfo:
+    """Validated window entry from List() or Details(). Missing or malformed fields are None."""
+    __slots__ = ("id", "wm_class", "wm_class_instance", "title", "pid", "monitor", "maximized",
+                 "x", "y", "width", "height", "in_current_workspace", "focus", "minimized", "_source")
+
+    FIELDS = ("id", *STRING_FIELDS, *INT_FIELDS, *BOOL_FIELDS)
+
+    def __init__(self, id: int, **fields):
+        self.id = id
+        for field in self.FIELDS[1:]:
+            setattr(self, field, fields.get(field))
+        # Decoded entry this record was built from, used to reuse records across snapshots
+        self._source: dict = None
+
+    @classmethod
+    def parse(cls, data: dict) -> "WindowInfo":
+        if not isinstance(data, dict):
+            return None
+        window_id = data.get("id")
+        if isinstance(window_id, bool) or not isinstance(window_id, (int, float, str)):
+            return None
+        try:
+            window_id = int(window_id)
+        except ValueError:
+            return None
+
+        info = cls(window_id)
+        for field in STRING_FIELDS:
+            value = data.get(field)
+            info.__setattr__(field, value if isinstance(value, str) else None)
+        for field in INT_FIELDS:
+            value = data.get(field)
+            info.__setattr__(field, int(value) if isinstance(value, (int, float)) else None)
+        for field in BOOL_FIELDS:
+            value = data.get(field)
+            info.__setattr__(field, bool(value) if isinstance(value, (bool, int)) else None)
+        info._source = data
+        return info
+
+    @classmethod
+    def parse_json(cls, raw: str) -> "WindowInfo":
+        return cls.parse(loads(raw))
+
+    @classmethod
+    def parse_list(cls, raw: str, previous: dict[int, "WindowInfo"] = None) -> list["WindowInfo"]:
+        # Records whose entry did not change since the previous snapshot are reused as they are
+        entries = loads(raw)
+        if not isinstance(entries, list):
+            raise ValueError(f"Expected a list of windows, got {type(entries).__name__}")
+
+        windows = []
+        for entry in entries:
+            old = previous.get(entry.get("id")) if previous and isinstance(entry, dict) else None
+            if old is not None and old._source == entry:
+                windows.append(old)
+                continue
+            info = cls.parse(entry)
+            if info is None:
+                log.debug(f"Skipping malformed window entry: {entry}")
+                continue
+            windows.append(info)
+        return windows
+
+    def with_title(self, title: str) -> "WindowInfo":
+        if title == self.title:
+            return self
+        info = WindowInfo(self.id, **{field: getattr(self, field) for field in self.FIELDS[1:]})
+        info.title = title
+        info._source = self._source
+        return info
+
+    def with_details(self, details: "WindowInfo") -> "WindowInfo":
+        # Copy with the fields this record lacks taken from a Details() record of the same window
+        missing = [field for field in self.FIELDS[1:] if getattr(self, field) is None and getattr(details, field) is not None]
+        if not missing:
+            return self
+        info = WindowInfo(self.id, **{field: getattr(self, field) for field in self.FIELDS[1:]})
+        for field in missing:
+            setattr(info, field, getattr(details, field))
+        info._source = self._source
+        return info
+
+    def get_geometry(self) -> dict:
+        # Known geometry fields, plus the maximized state if known
+        geometry = {field: getattr(self, field) for field in GEOMETRY_FIELDS if getattr(self, field) is not None}
+        if self.maximized is not None:
+            geometry["maximized"] = self.maximized
+        return geometry
+
+    def has_geometry(self) -> bool:
+        return None not in [self.x, self.y, self.width, self.height]
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in self.FIELDS if getattr(self, field) is not None}
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, field) for field in self.FIELDS)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, WindowInfo):
+            return NotImplemented
+        return self is other or self._values() == other._values()
+
+    def __hash__(self) -> int:
+        return hash(self.id)
+
+    def __repr__(self) -> str:
+        return f"WindowInfo(id={self.id}, wm_class={self.wm_class!r}, title={self.title!r})"
@@ -0,0 +1,671 @@
+# Import python modules
+import dbus
+import re
+import threading
+import time
+from concurrent.futures import Future, wait
+from contextlib import contextmanager
+from loguru import logger as log
+
+# Import internal modules
+from .MatchSpec import MatchSpec
+from .BatchResult import BatchResult
+from .Backoff import Backoff
+from .CircuitBreaker import CircuitBreaker
+from .CallStats import CallStats
+from .WindowTracker import WindowTracker
+from .WindowInfo import WindowInfo
+from .BusWorker import BusWorker, PRIORITY_MUTATION, PRIORITY_USER
+from .TraceRecorder import TraceRecorder
+
+GEOMETRY_FIELDS = ("x", "y", "width", "height")
+
+class WindowManager:
+    # Errors that count against the circuit breaker
+    TIMEOUT_ERRORS = ["org.freedesktop.DBus.Error.NoReply", "org.freedesktop.DBus.Error.Timeout", "org.freedesktop.DBus.Error.TimedOut"]
+    # Errors after which the proxy is dropped and rebuilt
+    DISCONNECT_ERRORS = [
+        "org.freedesktop.DBus.Error.ServiceUnknown", "org.freedesktop.DBus.Error.NameHasNoOwner", "org.freedesktop.DBus.Error.Disconnected",
+        "org.freedesktop.DBus.Error.UnknownObject", "org.freedesktop.DBus.Error.UnknownInterface"
+    ]
+    # Reads that identical concurrent requests share, every other method is a mutation
+    READ_METHODS = ["List", "Details", "GetTitle"]
+
+    def __init__(self, bus, snapshot_ttl: float = 0.25, call_timeout: float = 5):
+        self.bus = bus
+        self.proxy = None
+        self.interface = None
+        # Set once a proxy exists, operations queued before that wait for it
+        self.connected_event = threading.Event()
+
+        # Connection state is one of "connecting", "connected", "disconnected" (reconnecting) and "unavailable" (breaker open)
+        self.connection_state = "connecting"
+        self.connection_listeners: list = []
+        self.reconnect_backoff = Backoff(initial=0.5, maximum=30)
+        # A probe takes at most one call timeout, after that the next caller may probe
+        self.breaker = CircuitBreaker(failure_threshold=3, reset_timeout=5, max_reset_timeout=60, probe_timeout=call_timeout)
+        self._connect_lock = threading.Lock()
+
+        # Latency and call counts of every bus call
+        self.stats = CallStats()
+        # Opt-in record of every bus call, see start_trace
+        self.trace: TraceRecorder = None
+
+        # Shared List() snapshot. Callers within snapshot_ttl seconds of each other share one round-trip.
+        # generation increases whenever the snapshot content changes or gets invalidated, so callers
+        # can compare it against the generation their derived data was built from.
+        self.snapshot_ttl = snapshot_ttl
+        # Upper bound in seconds for a single bus call, instead of the 25s default of D-Bus
+        self.call_timeout = call_timeout
+        self._call_options = threading.local()
+        self.generation = 0
+        self._snapshot: list[WindowInfo] = None
+        self._snapshot_by_id: dict[int, WindowInfo] = {}
+        self._snapshot_raw: str = None
+        self._snapshot_time: float = 0
+        self._snapshot_lock = threading.Lock()
+        self._generation_lock = threading.Lock()
+
+        # Titles per window id with the time they were fetched. Dropped whenever the generation changes and
+        # fetched again after title_max_age seconds, since older extensions report title changes nowhere else.
+        self.title_max_age: float = 2
+        self._titles: dict[int, tuple[float, str]] = {}
+        self._titles_generation = 0
+        # Whether the installed extension includes titles in List(), then those are current with the List() data
+        self.list_has_titles = False
+        # Last known geometry per window id from List(), Details() or our own batches, trusted for geometry_max_age seconds
+        self.geometry_max_age: float = 2
+        self._geometries: dict[int, tuple[float, dict]] = {}
+        # Window fields a filter needs but the extension does not report, warned about once
+        self._unreported_fields: set[str] = set()
+        # Live window index, set by the plugin once started
+        self.tracker: WindowTracker = None
+
+        # Every bus call runs here: mutations first, identical reads merged, queue depth capped
+        self.bus_worker = BusWorker(max_workers=16, max_depth=256)
+
+        if bus is not None:
+            self.connect(bus)
+
+    def connect(self, bus: dbus.SessionBus) -> bool:
+        with self._connect_lock:
+            self.bus = bus
+            try:
+                self.proxy = bus.get_object("org.gnome.Shell", "/org/gnome/Shell/Extensions/Windows")
+                self.interface = dbus.Interface(self.proxy, "org.gnome.Shell.Extensions.Windows")
+            except dbus.exceptions.DBusException as e:
+                delay = self.reconnect_backoff.failed()
+                log.warning(f"Failed to connect to Window Calls, retrying in {delay:.1f}s. Error: {e}")
+                self._set_connection_state("disconnected")
+                return False
+            # The backoff is only reset by a successful call, the shell owns its name even without the extension
+            self.connected_event.set()
+            self._set_connection_state("connected")
+            return True
+
+    def disconnect(self) -> None:
+        self.proxy = None
+        self.interface = None
+        self.invalidate_snapshot()
+        self._set_connection_state("disconnected")
+
+    def wait_until_connected(self, timeout: float = None) -> bool:
+        return self.connected_event.wait(timeout)
+
+    def get_stats(self) -> dict[str, dict]:
+        return self.stats.get_stats()
+
+    def start_trace(self, path: str, record_responses: bool = False) -> None:
+        self.stop_trace()
+        self.trace = TraceRecorder(path, record_responses=record_responses)
+        log.info(f"Tracing Window Calls bus calls to {path}")
+
+    def stop_trace(self) -> None:
+        trace, self.trace = self.trace, None
+        if trace is not None:
+            trace.close()
+
+    def get_connection_state(self) -> str:
+        return self.connection_state
+
+    def add_connection_listener(self, callback) -> None:
+        self.connection_listeners.append(callback)
+
+    def remove_connection_listener(self, callback) -> None:
+        if callback in self.connection_listeners:
+            self.connection_listeners.remove(callback)
+
+    def _set_connection_state(self, state: str) -> None:
+        if state == self.connection_state:
+            return
+        log.info(f"Window Calls connection: {self.connection_state} -> {state}")
+        self.connection_state = state
+        for listener in list(self.connection_listeners):
+            try:
+                listener(state)
+            except Exception as e:
+                log.error(f"Connection listener failed. Error: {e}")
+
+    def _call(self, method: str, *args, timeout: float = None):
+        return self._submit_call(method, *args, timeout=timeout).result()
+
+    def _submit_call(self, method: str, *args, timeout: float = None) -> Future:
+        # timeout covers the time in the queue and the call itself
+        if timeout is None:
+            timeout = self.get_call_timeout()
+        deadline = time.monotonic() + timeout
+        origin = self.get_call_origin() if self.trace is not None else None
+        if method in self.READ_METHODS:
+            # Joining requests share the call, the trace names the first one as origin
+            return self.bus_worker.submit(self._invoke, method, args, deadline, origin, priority=self.get_call_priority(), key=(method, *args))
+        return self.bus_worker.submit(self._invoke, method, args, deadline, origin, priority=PRIORITY_MUTATION)
+
+    def _invoke(self, method: str, args: tuple, deadline: float, origin: str = None):
+        # Runs on a bus worker thread
+        interface = self.interface
+        if interface is None:
+            raise dbus.exceptions.DBusException("Not connected to Window Calls", name="org.freedesktop.DBus.Error.Disconnected")
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            self.stats.record(f"dbus.{method}", 0, error=True)
+            raise dbus.exceptions.DBusException("Deadline passed while queued", name="org.freedesktop.DBus.Error.LimitsExceeded")
+
+        start = time.perf_counter()
+        trace_start = time.time()
+        try:
+            result = getattr(interface, method)(*args, timeout=timeout)
+        except dbus.exceptions.DBusException as e:
+            self.stats.record(f"dbus.{method}", time.perf_counter() - start, error=True)
+            trace = self.trace
+            if trace is not None:
+                trace.record(method, args, origin, trace_start, time.time(), error=e.get_dbus_name())
+            self._on_call_error(e)
+            raise
+        self.stats.record(f"dbus.{method}", time.perf_counter() - start)
+        trace = self.trace
+        if trace is not None:
+            trace.record(method, args, origin, trace_start, time.time(), result=result)
+
+        self.breaker.record_success()
+        self.reconnect_backoff.reset()
+        if self.connection_state != "connected":
+            self._set_connection_state("connected")
+        return result
+
+    def _on_call_error(self, error: dbus.exceptions.DBusException) -> None:
+        name = error.get_dbus_name()
+        if name in self.DISCONNECT_ERRORS:
+            # gnome-shell restarted or the extension went away, the proxy has to be rebuilt.
+            # Concurrent calls failing on the same proxy only count once against the backoff.
+            if self.interface is not None:
+                delay = self.reconnect_backoff.failed()
+                log.warning(f"Lost Window Calls ({name}), reconnecting in {delay:.1f}s")
+            self.disconnect()
+        elif name in self.TIMEOUT_ERRORS:
+            self.breaker.record_failure()
+            if self.breaker.is_open():
+                self._set_connection_state("unavailable")
+        else:
+            # Any other error is still an answer, the shell is responsive
+            self.breaker.record_success()
+
+    def get_call_timeout(self) -> float:
+        return getattr(self._call_options, "timeout", None) or self.call_timeout
+
+    def get_call_origin(self) -> str:
+        # Operation the current thread works for, the thread name if none was set
+        return getattr(self._call_options, "origin", None) or threading.current_thread().name
+
+    @contextmanager
+    def call_origin(self, origin: str):
+        # Names the operation behind the bus calls the current thread makes within the block, for traces
+        previous = getattr(self._call_options, "origin", None)
+        self._call_options.origin = origin
+        try:
+            yield
+        finally:
+            self._call_options.origin = previous
+
+    def get_call_priority(self) -> int:
+        priority = getattr(self._call_options, "priority", None)
+        return PRIORITY_USER if priority is None else priority
+
+    @contextmanager
+    def call_priority(self, priority: int):
+        # Priority of the reads the current thread makes within the block, see BusWorker
+        previous = getattr(self._call_options, "priority", None)
+        self._call_options.priority = priority
+        try:
+            yield
+        finally:
+            self._call_options.priority = previous
+
+    @contextmanager
+    def call_timeout_override(self, timeout: float):
+        # Applies to all bus calls made by the current thread within the block
+        previous = getattr(self._call_options, "timeout", None)
+        self._call_options.timeout = timeout
+        try:
+            yield
+        finally:
+            self._call_options.timeout = previous
+
+    def get_all_windows(self, max_age: float = None) -> list[WindowInfo]:
+        if not self.get_is_connected(): return []
+        try:
+            return self.load_all_windows(max_age)
+        except Exception as e:
+            log.error(f"Failed to get all windows. Error: {e}")
+            return []
+
+    def load_all_windows(self, max_age: float = None) -> list[WindowInfo]:
+        # Same as get_all_windows, but raises on failure so callers can tell errors from an empty desktop
+        if max_age is None:
+            max_age = self.snapshot_ttl
+
+        # Holding the lock during the call lets concurrent callers wait for and reuse the same reply
+        with self._snapshot_lock:
+            if self._snapshot is not None and time.monotonic() - self._snapshot_time <= max_age:
+                return list(self._snapshot)
+
+            start_generation = self.generation
+            raw = self._call("List")
+            # Unchanged entries keep their record from the previous snapshot
+            windows = WindowInfo.parse_list(raw, self._snapshot_by_id)
+
+            with self._generation_lock:
+                # A mutation that happened while List() was in flight may not be reflected in the reply
+                invalidated = self.generation != start_generation
+                if raw != self._snapshot_raw:
+                    self.generation += 1
+                self._snapshot = windows
+                self._snapshot_by_id = {window.id: window for window in windows}
+                self._snapshot_raw = raw
+                self._snapshot_time = 0 if invalidated else time.monotonic()
+                # Newer versions of the extension already include the title in List()
+                listed_titles = {window.id: (time.monotonic(), window.title) for window in windows if window.title is not None}
+                if windows:
+                    self.list_has_titles = bool(listed_titles)
+                if listed_titles:
+                    self._get_title_cache().update(listed_titles)
+            for window in windows:
+                self._remember_geometry(window.id, window.get_geometry())
+            return list(windows)
+
+    def invalidate_snapshot(self) -> None:
+        with self._generation_lock:
+            self._snapshot_time = 0
+            self.generation += 1
+
+    def get_generation(self) -> int:
+        return self.generation
+    
+    def get_window_details(self, id: int) -> WindowInfo:
+        if not self.get_is_connected(): return None
+        try:
+            details = WindowInfo.parse_json(self._call("Details", str(id)))
+        except Exception as e:
+            log.error(f"Failed to get window details. Error: {e}")
+            return None
+        if details is not None:
+            self._remember_geometry(id, details.get_geometry())
+        return details
+
+    def get_windows_details(self, window_ids: list[int]) -> dict[int, WindowInfo]:
+        # Details of several windows with overlapping round-trips. Windows that vanished in between are left out.
+        if not self.get_is_connected(): return {}
+        timeout = self.get_call_timeout()
+
+        futures = [self._submit_call("Details", str(window_id), timeout=timeout) for window_id in window_ids]
+
+        details = {}
+        for window_id, future in zip(window_ids, futures):
+            try:
+                window_details = WindowInfo.parse_json(future.result())
+            except Exception as e:
+                log.error(f"Failed to get window details. Error: {e}")
+                continue
+            if window_details is not None:
+                details[window_id] = window_details
+                self._remember_geometry(window_id, window_details.get_geometry())
+        return details
+
+    def get_windows_info(self, window_ids: list[int]) -> list[WindowInfo]:
+        # List() records with titles for the given windows, without any Details() calls
+        if not self.get_is_connected(): return []
+        known = {window.id: window for window in self._get_windows()}
+        windows = [known[window_id] for window_id in window_ids if window_id in known]
+        titles = self.get_current_titles(windows)
+        return [window.with_title(titles[window.id]) for window in windows]
+
+    def _remember_geometry(self, window_id: int, geometry: dict, merge: bool = False) -> None:
+        # geometry holds any of "x", "y", "width", "height" and "maximized"
+        if merge:
+            # A Move or Resize only changes half of the geometry, keep the other half if it is still recent
+            geometry = {**(self.get_known_geometry(window_id) or {}), **geometry}
+        if geometry:
+            self._geometries[window_id] = (time.monotonic(), geometry)
+
+    def forget_geometry(self, window_id: int) -> None:
+        self._geometries.pop(window_id, None)
+
+    def get_known_geometry(self, window_id: int) -> dict:
+        entry = self._geometries.get(window_id)
+        if entry is None or time.monotonic() - entry[0] > self.geometry_max_age:
+            return None
+        return entry[1]
+
+    def is_in_place(self, window_id: int, target: dict, tolerance: int = 0) -> bool:
+        # Only known, recent geometry counts. Maximized windows are never in place, since moving them unmaximizes.
+        current = self.get_known_geometry(window_id)
+        if current is None or current.get("maximized"):
+            return False
+        for field in GEOMETRY_FIELDS:
+            if field not in target:
+                continue
+            if field not in current or abs(current[field] - target[field]) > tolerance:
+                return False
+        return True
+    
+    def move_window_to(self, id: int, x: int, y: int):
+        if not self.get_is_connected(): return
+        try:
+            self._call("Move", str(id), x, y)
+        except Exception as e:
+            log.error(f"Failed to move window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def move_resize_window(self, id: int, x: int, y: int, width: int, height: int):
+        if not self.get_is_connected(): return
+        try:
+            self._call("MoveResize", str(id), x, y, width, height)
+        except Exception as e:
+            log.error(f"Failed to move and resize window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def resize_window_to(self, id: int, width: int, height: int):
+        if not self.get_is_connected(): return
+        try:
+            self._call("Resize", str(id), width, height)
+        except Exception as e:
+            log.error(f"Failed to resize window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def move_resize_many(self, window_ids: list[int], position: tuple[int, int] = None, size: tuple[int, int] = None, timeout: float = None, tolerance: int = None) -> BatchResult:
+        # Sends the call for every window at once. timeout is one deadline for the whole batch.
+        # With a tolerance, windows already within tolerance pixels of the target are skipped.
+        if position is None and size is None: return BatchResult()
+
+        geometry = {}
+        if position is not None:
+            geometry["x"], geometry["y"] = position
+        if size is not None:
+            geometry["width"], geometry["height"] = size
+        return self.apply_geometries({window_id: geometry for window_id in window_ids}, timeout=timeout, tolerance=tolerance)
+
+    def apply_geometries(self, geometries: dict[int, dict], timeout: float = None, tolerance: int = None) -> BatchResult:
+        # Like move_resize_many, but with an own target per window: {id: {"x", "y", "width", "height"}}, each pair optional
+        result = BatchResult()
+        if not self.get_is_connected() or not geometries: return result
+
+        calls = {}
+        for window_id, geometry in geometries.items():
+            if tolerance is not None and self.is_in_place(window_id, geometry, tolerance):
+                result.skipped.append(window_id)
+                continue
+            call = self._geometry_call(geometry)
+            if call is not None:
+                calls[window_id] = call
+
+        if timeout is None:
+            timeout = self.get_call_timeout()
+        start = time.monotonic()
+
+        futures = {self._submit_call(method, str(window_id), *args, timeout=timeout): window_id for window_id, (method, args) in calls.items()}
+        done, not_done = wait(futures, timeout=timeout)
+        for future in done:
+            error = future.exception()
+            if error is None:
+                result.succeeded.append(futures[future])
+                self._remember_geometry(futures[future], geometries[futures[future]], merge=True)
+            else:
+                result.failed[futures[future]] = str(error)
+        for future in not_done:
+            future.cancel()
+            result.failed[futures[future]] = "deadline exceeded"
+        for window_id in result.failed:
+            self.forget_geometry(window_id)
+
+        result.duration = time.monotonic() - start
+        if calls:
+            self.invalidate_snapshot()
+        if not result.ok():
+            log.error(f"Failed to update {len(result.failed)} of {result.get_total()} windows. Errors: {set(result.failed.values())}")
+        return result
+
+    @staticmethod
+    def _geometry_call(geometry: dict) -> tuple[str, tuple]:
+        has_position = "x" in geometry and "y" in geometry
+        has_size = "width" in geometry and "height" in geometry
+        if has_position and has_size:
+            return "MoveResize", (int(geometry["x"]), int(geometry["y"]), int(geometry["width"]), int(geometry["height"]))
+        if has_position:
+            return "Move", (int(geometry["x"]), int(geometry["y"]))
+        if has_size:
+            return "Resize", (int(geometry["width"]), int(geometry["height"]))
+        return None
+
+    def maximize_window(self, id: int) -> None:
+        if not self.get_is_connected(): return
+        try:
+            self._call("Maximize", str(id))
+        except Exception as e:
+            log.error(f"Failed to maximize window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def minimize_window(self, id: int) -> None:
+        if not self.get_is_connected(): return
+        try:
+            self._call("Minimize", str(id))
+        except Exception as e:
+            log.error(f"Failed to minimize window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def unmaximize_window(self, id: int) -> None:
+        if not self.get_is_connected(): return
+        try:
+            self._call("Unmaximize", str(id))
+        except Exception as e:
+            log.error(f"Failed to unmaximize window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def unminimize_window(self, id: int) -> None:
+        if not self.get_is_connected(): return
+        try:
+            self._call("Unminimize", str(id))
+        except Exception as e:
+            log.error(f"Failed to unminimize window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def activate_window(self, id: int) -> None:
+        if not self.get_is_connected(): return
+        try:
+            self._call("Activate", str(id))
+        except Exception as e:
+            log.error(f"Failed to activate window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def close_window(self, id: int) -> None:
+        if not self.get_is_connected(): return
+        try:
+            self._call("Close", str(id))
+        except Exception as e:
+            log.error(f"Failed to close window. Error: {e}")
+        finally:
+            self.invalidate_snapshot()
+            self.forget_geometry(id)
+
+    def get_title(self, id: int) -> str:
+        if not self.get_is_connected(): return ""
+        try:
+            return self._call("GetTitle", str(id))
+        except Exception as e:
+            log.error(f"Failed to get title. Error: {e}")
+            return ""
+    
+    def get_all_wm_classes(self) -> list[str]:
+        if not self.get_is_connected(): return []
+        classes: str = []
+        for window in self.get_all_windows():
+            classes.append(window.wm_class)
+        return classes
+    
+    def get_all_titles(self) -> list[str]:
+        if not self.get_is_connected(): return []
+        return list(self.get_current_titles(self._get_windows()).values())
+
+    def _get_windows(self) -> list[WindowInfo]:
+        # The live index while it is up to date, otherwise the List() snapshot
+        if self.tracker is not None and self.tracker.is_fresh():
+            return self.tracker.get_windows()
+        return self.get_all_windows()
+
+    def get_current_titles(self, windows: list[WindowInfo]) -> dict[int, str]:
+        # Titles from List() if the extension includes them. Otherwise titles of the index may be outdated,
+        # since a title change alone does not change List(), so they come from get_titles.
+        if self.list_has_titles:
+            return {window.id: window.title or "" for window in windows}
+        return self.get_titles([window.id for window in windows])
+
+    def get_titles(self, window_ids: list[int], refresh: bool = False) -> dict[int, str]:
+        # With refresh, cached titles are fetched again as well
+        if not self.get_is_connected(): return {}
+        titles = self._get_title_cache()
+        now = time.monotonic()
+        missing = [
+            window_id for window_id in window_ids
+            if refresh or window_id not in titles or now - titles[window_id][0] > self.title_max_age
+        ]
+        if missing:
+            # Send all GetTitle calls at once so their round-trips overlap instead of adding up
+            timeout = self.get_call_timeout()
+            futures = [self._submit_call("GetTitle", str(window_id), timeout=timeout) for window_id in missing]
+            for window_id, future in zip(missing, futures):
+                try:
+                    titles[window_id] = (time.monotonic(), str(future.result()))
+                except Exception as e:
+                    log.error(f"Failed to get title. Error: {e}")
+        return {window_id: titles[window_id][1] if window_id in titles else "" for window_id in window_ids}
+
+    def _get_title_cache(self) -> dict[int, tuple[float, str]]:
+        # Titles cached for an older generation may belong to a changed snapshot, start over then
+        generation = self.generation
+        if self._titles_generation != generation:
+            self._titles = {}
+            self._titles_generation = generation
+        return self._titles
+    
+    def find_windows_by_class_and_title(self, wm_class_pattern: str, title_pattern: str, current_workspace: bool = False, monitor: int = None,
+                                        focused: bool = False, skip_minimized: bool = False) -> list[int]:
+        return self.find_windows_by_spec(MatchSpec(wm_class_pattern, title_pattern, current_workspace=current_workspace, monitor=monitor,
+                                                   focused=focused, skip_minimized=skip_minimized))
+
+    def find_windows_by_spec(self, spec: MatchSpec) -> list[int]:
+        return self.find_windows_by_specs([spec])[0]
+
+    def find_windows_by_specs(self, specs: list[MatchSpec]) -> list[list[int]]:
+        # Resolves several specs against one snapshot, with a single title batch for all of them
+        if not self.get_is_connected(): return [[] for _ in specs]
+
+        ## Filter and match on wm_class first, from the live index without a List() call when it is up to date.
+        ## Titles are only needed for the remaining windows.
+        windows = self.fill_filter_fields(specs, self._get_windows())
+        class_matches = [[window for window in windows if spec.match_window(window)] for spec in specs]
+
+        need_titles = {window.id: window for spec, matches in zip(specs, class_matches) if not spec.matches_all_titles() for window in matches}
+        titles = self.get_current_titles(list(need_titles.values())) if need_titles else {}
+        class_matches = [[window.id for window in matches] for matches in class_matches]
+
+        return [
+            matches if spec.matches_all_titles() else [window_id for window_id in matches if spec.match_title(titles[window_id])]
+            for spec, matches in zip(specs, class_matches)
+        ]
+
+    def fill_filter_fields(self, specs: list[MatchSpec], windows: list[WindowInfo]) -> list[WindowInfo]:
+        # The monitor and minimized filters read fields List() does not carry. Those come from Details(),
+        # fetched only for the windows whose wm_class matches a spec with such a filter.
+        missing = [
+            window.id for window in windows
+            if any(spec.is_valid() and spec.needs_details(window) and spec.match_class(window.wm_class) for spec in specs)
+        ]
+        if not missing:
+            return windows
+        details = self.get_windows_details(missing)
+        windows = [window.with_details(details[window.id]) if window.id in details else window for window in windows]
+
+        unreported = {field for spec in specs for field in spec.get_filter_fields() for window in windows if window.id in details and getattr(window, field) is None}
+        for field in unreported - self._unreported_fields:
+            log.warning(f"The installed Window Calls extension does not report {field!r}, filters on it are ignored")
+        self._unreported_fields |= unreported
+        return windows
+
+    def resolve_layout(self, specs: list[MatchSpec], matches: list[list[int]] = None) -> dict[int, dict]:
+        # Every rule gets the first matching window that no earlier rule took. matches can be passed in if already resolved.
+        if matches is None:
+            matches = self.find_windows_by_specs(specs)
+        geometries: dict[int, dict] = {}
+        for spec, window_ids in zip(specs, matches):
+            geometry = spec.get_geometry()
+            if not geometry:
+                continue
+            for window_id in window_ids:
+                if window_id not in geometries:
+                    geometries[window_id] = geometry
+                    break
+        return geometries
+
+    def capture_layout(self) -> list[dict]:
+        # Current geometry of the windows on the current workspace as layout rules
+        if not self.get_is_connected(): return []
+        windows = [window for window in self.get_all_windows() if window.in_current_workspace is not False]
+        window_ids = [window.id for window in windows]
+        titles = self.get_titles(window_ids)
+        details = self.get_windows_details(window_ids)
+
+        rules = []
+        for window in windows:
+            window_details = details.get(window.id)
+            if window_details is None or window.wm_class is None:
+                continue
+            rules.append({
+                "wm_class": f"^{re.escape(window.wm_class)}$",
+                "title": f"^{re.escape(titles.get(window.id, ''))}$",
+                "position": {"x": window_details.x or 0, "y": window_details.y or 0},
+                "size": {"width": window_details.width or 0, "height": window_details.height or 0}
+            })
+        return rules
+    
+    def get_is_connected(self) -> bool:
+        ## Reconnect lazily once the backoff allows another attempt
+        if self.interface is None and self.bus is not None and self.reconnect_backoff.ready():
+            self.connect(self.bus)
+        if None in [self.proxy, self.interface]:
+            return False
+        # Fail fast while the shell does not answer
+        return self.breaker.allow()
\ No newline at end of file
@@ -0,0 +1,162 @@
+# Import gtk modules - used for the config rows
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Gtk, Adw
+
+# Import internal modules
+from .MatchSpec import MatchSpec
+from .MatchSuggestions import MatchSuggestions
+from .DialCoalescer import DialCoalescer, DIAL_AXIS_LABELS
+
+class WindowMatchAction:
+    """
+    Shared parts of the actions that work on the windows matching a wm_class and title regex: the match and
+    filter config rows, the MatchSpec and its registration, and the connection state label.
+    Mix in before ActionBase, e.g. class Move(WindowMatchAction, ActionBase), and call init_window_match() in __init__.
+    The action implements on_row_changed, which gets connected to the match rows.
+    Actions with geometry targets also get the tolerance and dial rows: set DIAL_AXES to the fields the dial
+    can adjust and call init_dial() in __init__.
+    """
+    # Geometry fields the dial can adjust, the first one is the default
+    DIAL_AXES: list[str] = []
+
+    def init_window_match(self) -> None:
+        self.match_spec: MatchSpec = None
+        self.plugin_base.window_manager.add_connection_listener(self.on_connection_state_changed)
+
+    def on_connection_state_changed(self, state: str) -> None:
+        if state == "connecting":
+            self.set_bottom_label(self.plugin_base.lm.get("actions.connecting"))
+        elif state in ["disconnected", "unavailable"]:
+            self.set_bottom_label(self.plugin_base.lm.get("actions.disconnected"))
+        else:
+            self.set_bottom_label(None)
+
+    def on_removed_from_cache(self) -> None:
+        # The window manager and match registry outlive the action, drop the references to it
+        self.plugin_base.window_manager.remove_connection_listener(self.on_connection_state_changed)
+        self.plugin_base.match_registry.unregister(self)
+        super().on_removed_from_cache()
+
+    def create_match_rows(self) -> list:
+        # Regex and filter rows, call load_match_defaults and then connect_match_rows once all rows exist
+        lm = self.plugin_base.lm
+        self.wm_row = Adw.EntryRow(title=lm.get("actions.wm_class_regex_entry.title"), text=".*")
+        self.title_row = Adw.EntryRow(title=lm.get("actions.title_regex_entry.title"), text=".*")
+
+        self.current_workspace_switch = Adw.SwitchRow(title=lm.get("actions.filters.current_workspace"))
+        self.monitor_spinner = Adw.SpinRow.new_with_range(-1, 16, 1)
+        self.monitor_spinner.set_title(lm.get("actions.filters.monitor.title"))
+        self.monitor_spinner.set_subtitle(lm.get("actions.filters.monitor.subtitle"))
+        self.focused_switch = Adw.SwitchRow(title=lm.get("actions.filters.focused"))
+        self.skip_minimized_switch = Adw.SwitchRow(title=lm.get("actions.filters.skip_minimized"))
+
+        return [self.wm_row, self.title_row, self.current_workspace_switch, self.monitor_spinner, self.focused_switch, self.skip_minimized_switch]
+
+    def load_match_defaults(self, settings: dict) -> None:
+        self.wm_row.set_text(settings.get("wm_class", ".*"))
+        self.title_row.set_text(settings.get("title", ".*"))
+        filters = settings.get("filters", {})
+        self.current_workspace_switch.set_active(filters.get("current_workspace", False))
+        self.monitor_spinner.set_value(filters.get("monitor", -1))
+        self.focused_switch.set_active(filters.get("focused", False))
+        self.skip_minimized_switch.set_active(filters.get("skip_minimized", False))
+
+    def connect_match_rows(self) -> None:
+        self.show_pattern_errors()
+        self.suggestions = MatchSuggestions(self.plugin_base.suggestion_index, self.plugin_base.lm, self.wm_row, self.title_row, lambda: self.match_spec)
+
+        self.wm_row.connect("changed", self.on_row_changed)
+        self.title_row.connect("changed", self.on_row_changed)
+        self.current_workspace_switch.connect("notify::active", self.on_row_changed)
+        self.monitor_spinner.connect("changed", self.on_row_changed)
+        self.focused_switch.connect("notify::active", self.on_row_changed)
+        self.skip_minimized_switch.connect("notify::active", self.on_row_changed)
+
+    def store_match_settings(self, settings: dict) -> None:
+        settings["wm_class"] = self.wm_row.get_text()
+        settings["title"] = self.title_row.get_text()
+        settings["filters"] = {
+            "current_workspace": self.current_workspace_switch.get_active(),
+            "monitor": int(self.monitor_spinner.get_value()),
+            "focused": self.focused_switch.get_active(),
+            "skip_minimized": self.skip_minimized_switch.get_active()
+        }
+
+    def on_match_settings_changed(self) -> None:
+        # Call after set_settings
+        self.update_match_spec()
+        self.show_pattern_errors()
+        self.suggestions.update_count()
+
+    def update_match_spec(self) -> None:
+        self.match_spec = MatchSpec.from_settings(self.get_settings())
+        self.plugin_base.match_registry.register(self, [self.match_spec])
+
+    def get_match_spec(self) -> MatchSpec:
+        if self.match_spec is None:
+            self.update_match_spec()
+        return self.match_spec
+
+    def show_pattern_errors(self) -> None:
+        if self.match_spec is None:
+            return
+        for row, error in [(self.wm_row, self.match_spec.wm_class_error), (self.title_row, self.match_spec.title_error)]:
+            if error is None:
+                row.remove_css_class("error")
+            else:
+                row.add_css_class("error")
+
+    def init_dial(self) -> None:
+        self.dial = DialCoalescer(self.plugin_base.window_manager)
+        self.dial_steps: dict[str, int] = {}
+
+    def create_tolerance_row(self) -> Adw.SpinRow:
+        self.tolerance_spinner = Adw.SpinRow.new_with_range(0, 500, 1)
+        self.tolerance_spinner.set_title(self.plugin_base.lm.get("actions.tolerance.title"))
+        return self.tolerance_spinner
+
+    def create_dial_rows(self) -> list:
+        lm = self.plugin_base.lm
+        self.dial_axis_row = Adw.ComboRow(
+            title=lm.get("actions.dial_axis.title"),
+            model=Gtk.StringList.new([lm.get(DIAL_AXIS_LABELS[axis]) for axis in self.DIAL_AXES])
+        )
+        self.dial_step_spinner = Adw.SpinRow.new_with_range(1, 1000, 1)
+        self.dial_step_spinner.set_title(lm.get("actions.dial_step.title"))
+        return [self.dial_axis_row, self.dial_step_spinner]
+
+    def load_geometry_defaults(self, settings: dict) -> None:
+        # Tolerance and dial rows
+        self.tolerance_spinner.set_value(settings.get("tolerance", 0))
+        dial = settings.get("dial", {})
+        if dial.get("axis") in self.DIAL_AXES:
+            self.dial_axis_row.set_selected(self.DIAL_AXES.index(dial["axis"]))
+        self.dial_step_spinner.set_value(dial.get("step", 10))
+
+    def connect_geometry_rows(self) -> None:
+        self.tolerance_spinner.connect("changed", self.on_row_changed)
+        self.dial_axis_row.connect("notify::selected", self.on_row_changed)
+        self.dial_step_spinner.connect("changed", self.on_row_changed)
+
+    def store_geometry_settings(self, settings: dict) -> None:
+        settings["tolerance"] = int(self.tolerance_spinner.get_value())
+        settings["dial"] = {
+            "axis": self.DIAL_AXES[self.dial_axis_row.get_selected()],
+            "step": int(self.dial_step_spinner.get_value())
+        }
+
+    def load_dial_settings(self) -> None:
+        dial = self.get_settings().get("dial", {})
+        axis = dial.get("axis")
+        if axis not in self.DIAL_AXES:
+            axis = self.DIAL_AXES[0]
+        self.dial_steps = {axis: int(dial.get("step", 10))}
+
+    def on_dial_turn(self, direction: int) -> None:
+        self.dial.turn(self.get_match_spec(), direction, self.dial_steps)
+
+    def submit_in_background(self, fn, *args):
+        # Key handlers return right away, the windows get updated on the async backend
+        return self.plugin_base.async_window_manager.submit(fn, *args)
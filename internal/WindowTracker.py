@@ -0,0 +1,164 @@
+# Import python modules
+import threading
+import time
+from loguru import logger as log
+
+# Import internal modules
+from .WindowInfo import WindowInfo
+from .BusWorker import PRIORITY_BACKGROUND
+
+class WindowTracker:
+    """
+    Live index of all windows (id -> WindowInfo from List(), with title), kept up to date in the background.
+    Any signal on the Window Calls interface triggers an early refresh, otherwise List() is polled.
+    Listeners are called with ("added" | "removed" | "changed", window_id, window).
+    """
+    def __init__(self, window_manager, poll_interval: float = 2, title_refresh_interval: float = 0):
+        self.window_manager = window_manager
+        self.poll_interval = poll_interval
+        # Fetch the titles of all windows again every this many seconds, 0 turns it off.
+        # Titles that change without their List() entry changing are only seen with it.
+        self.title_refresh_interval = title_refresh_interval
+
+        self.windows: dict[int, WindowInfo] = {}
+        self.generation = 0
+        self.last_refresh: float = None
+        self.last_title_refresh: float = 0
+        # Titles of a seeded index come from a previous run and get fetched again on the first refresh
+        self._seeded = False
+
+        self.listeners: list = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+        self._signal_match = None
+
+    def start(self) -> None:
+        if self.is_running():
+            return
+        self._stop.clear()
+        self._subscribe_signals()
+        self._thread = threading.Thread(target=self._run, name="GnomeWindowCalls-tracker", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wakeup.set()
+        if self._signal_match is not None:
+            self._signal_match.remove()
+            self._signal_match = None
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def is_fresh(self) -> bool:
+        # Only answer from memory while polling keeps up
+        if not self.is_running() or self.last_refresh is None:
+            return False
+        return time.monotonic() - self.last_refresh < self.poll_interval * 3
+
+    def request_refresh(self) -> None:
+        self._wakeup.set()
+
+    def add_listener(self, callback) -> None:
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback) -> None:
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def seed(self, windows: list[WindowInfo]) -> None:
+        # Start from a previously saved index. Until the first refresh replaces it, matches on class and filters
+        # are answered from it. The first refresh fetches the titles of all windows again.
+        with self._lock:
+            if self.last_refresh is not None or not windows:
+                return
+            self.windows = {window.id: window for window in windows}
+            self.generation += 1
+            self.last_refresh = time.monotonic()
+            self._seeded = True
+
+    def get_windows(self) -> list[WindowInfo]:
+        with self._lock:
+            return list(self.windows.values())
+
+    def _subscribe_signals(self) -> None:
+        try:
+            self._signal_match = self.window_manager.bus.add_signal_receiver(
+                self._on_signal,
+                dbus_interface="org.gnome.Shell.Extensions.Windows",
+                member_keyword="member"
+            )
+        except Exception as e:
+            log.debug(f"Window signals not available, polling only. Error: {e}")
+
+    def _on_signal(self, *args, member: str = None) -> None:
+        self.request_refresh()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.clear()
+            try:
+                # Key presses and mutations go first
+                with self.window_manager.call_priority(PRIORITY_BACKGROUND), self.window_manager.call_origin("WindowTracker.refresh"):
+                    self.refresh()
+            except Exception as e:
+                log.error(f"Failed to refresh window index. Error: {e}")
+            self._wakeup.wait(self.poll_interval)
+
+    def refresh(self) -> None:
+        # Titles are only fetched for new windows and windows whose class changed, and for all windows every title_refresh_interval if set
+        if not self.window_manager.get_is_connected():
+            return
+        listed = self.window_manager.load_all_windows(max_age=0)
+        now = time.monotonic()
+        refresh_titles = self._seeded or (self.title_refresh_interval > 0 and now - self.last_title_refresh >= self.title_refresh_interval)
+
+        old_windows = self.windows
+        new_windows: dict[int, WindowInfo] = {}
+        need_title: list[int] = []
+        for window in listed:
+            old = old_windows.get(window.id)
+            if window.title is None:
+                if old is not None and old.wm_class == window.wm_class and not refresh_titles:
+                    # Reuses the old record as is when nothing else changed either
+                    window = old if old._source is window._source else window.with_title(old.title)
+                else:
+                    need_title.append(window.id)
+            new_windows[window.id] = window
+
+        if need_title:
+            for window_id, title in self.window_manager.get_titles(need_title, refresh=refresh_titles).items():
+                new_windows[window_id] = new_windows[window_id].with_title(title)
+        if refresh_titles:
+            self.last_title_refresh = now
+            self._seeded = False
+
+        ## Diff against the previous index
+        events = []
+        for window_id, window in new_windows.items():
+            old = old_windows.get(window_id)
+            if old is None:
+                events.append(("added", window_id, window))
+            elif old != window:
+                events.append(("changed", window_id, window))
+        for window_id, window in old_windows.items():
+            if window_id not in new_windows:
+                events.append(("removed", window_id, window))
+
+        with self._lock:
+            self.windows = new_windows
+            self.last_refresh = now
+            if events:
+                self.generation += 1
+
+        for event in events:
+            self._emit(*event)
+
+    def _emit(self, event: str, window_id: int, window: WindowInfo) -> None:
+        for listener in list(self.listeners):
+            try:
+                listener(event, window_id, window)
+            except Exception as e:
+                log.error(f"Window tracker listener failed. Error: {e}")
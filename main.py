@@ -10,15 +10,30 @@ from .actions.Move.Move import Move
 from .actions.Status.Status import Status
 from .actions.Resize.Resize import Resize
 from .actions.MoveResize.MoveResize import MoveResize
+from .actions.Layout.Layout import Layout
+
+# Import internal modules
+from .internal.WindowManager import WindowManager
+from .internal.AsyncWindowManager import AsyncWindowManager
+from .internal.WindowTracker import WindowTracker
+from .internal.MatchRegistry import MatchRegistry
+from .internal.WindowAnimator import WindowAnimator
+from .internal.WarmStartCache import WarmStartCache
+from .internal.SuggestionIndex import SuggestionIndex
 
 # Import python modules
 import dbus
 from loguru import logger as log
-import json
-import re
+import os
+import threading
+
+import globals as gl
 
 class GnomeWindowCalls(PluginBase):
+    EXTENSION_UUID = "window-calls@domandoman.xyz"
+
     def __init__(self):
+        start = time.perf_counter()
         super().__init__()
 
         self.lm = self.locale_manager
@@ -62,6 +77,19 @@ class GnomeWindowCalls(PluginBase):
         )
         self.add_action_holder(self.move_resize_action_holder)
 
+        self.layout_action_holder = ActionHolder(
+            plugin_base = self,
+            action_base = Layout,
+            action_id_suffix = "Layout",
+            action_name = self.lm.get("actions.layout.name"),
+            action_support={
+                Input.Key: ActionInputSupport.SUPPORTED,
+                Input.Dial: ActionInputSupport.SUPPORTED,
+                Input.Touchscreen: ActionInputSupport.UNTESTED
+            }
+        )
+        self.add_action_holder(self.layout_action_holder)
+
         # Register plugin
         self.register(
             plugin_name = self.lm.get("plugin.name"),
@@ -71,19 +99,89 @@ class GnomeWindowCalls(PluginBase):
         )
         self.request_dbus_permission("org.gnome.Shell.Extensions.Windows")
 
-        self.bus = dbus.SessionBus()
-        self.extension_manager = ExtensionManager(self.bus)
-        self.handle_extension_installation()
-        self.window_manager = WindowManager(self.bus)
+        ## The bus, the extension check and the window proxy are set up by connect() on a background thread
+        self.bus: dbus.SessionBus = None
+        self.extension_manager: ExtensionManager = None
 
+        settings = self.get_settings()
+        self.window_manager = WindowManager(
+            self.bus,
+            snapshot_ttl=settings.get("snapshot_ttl", 0.25),
+            call_timeout=settings.get("call_timeout", 5)
+        )
+        self.async_window_manager = AsyncWindowManager(self.window_manager)
+        # Shared by all actions, so every animated window moves on the same frame tick
+        self.window_animator = WindowAnimator(self.async_window_manager)
+        self.window_tracker = WindowTracker(
+            self.window_manager,
+            poll_interval=settings.get("poll_interval", 2),
+            title_refresh_interval=settings.get("title_refresh_interval", 0)
+        )
+        self.window_manager.tracker = self.window_tracker
+        self.match_registry = MatchRegistry(self.window_manager)
+        self.window_tracker.add_listener(self.match_registry.on_window_event)
+        self.suggestion_index = SuggestionIndex()
+        self.window_tracker.add_listener(self.suggestion_index.on_window_event)
+        self.window_manager.stats.start_periodic_dump(settings.get("stats_dump_interval", 0))
+        if settings.get("trace_file"):
+            self.window_manager.start_trace(settings["trace_file"], record_responses=settings.get("trace_responses", False))
+        # Next to the plugin settings in the StreamController data directory, the plugin directory gets replaced on updates
+        self.warm_start_cache = WarmStartCache(
+            os.path.join(gl.DATA_PATH, "settings", "plugins", self.get_plugin_id(), "warm_start.json"),
+            windows_max_age=settings.get("warm_start_max_age", 24 * 3600)
+        )
+
+        threading.Thread(target=self.connect, name="GnomeWindowCalls-connect", daemon=True).start()
+        log.info(f"GnomeWindowCalls registered in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    def connect(self) -> None:
+        start = time.perf_counter()
+
+        ## Start from the state of the previous run, both get revalidated below
+        self.warm_start_cache.load()
+        self.window_tracker.seed(self.warm_start_cache.get_windows())
+        self.suggestion_index.rebuild(self.window_tracker.get_windows())
+        self.warm_start_cache.track(self.window_tracker)
+        extension_known = self.warm_start_cache.get_extension_installed(self.EXTENSION_UUID)
+
+        # Actions show "connecting" until the bus is up, retry on the window manager's reconnect backoff
+        while self.bus is None:
+            try:
+                self.bus = dbus.SessionBus()
+                self.extension_manager = ExtensionManager(self.bus)
+            except Exception as e:
+                self.bus = None
+                delay = self.window_manager.reconnect_backoff.failed()
+                log.error(f"Failed to connect to gnome shell, retrying in {delay:.1f}s. Error: {e}")
+                time.sleep(delay)
+
+        # A failed or declined install must not keep the window manager from reconnecting later
+        if not extension_known:
+            try:
+                self.handle_extension_installation()
+            except Exception as e:
+                log.error(f"Failed to check the Window Calls extension. Error: {e}")
+
+        self.window_manager.connect(self.bus)
+        self.window_tracker.start()
+        log.info(f"GnomeWindowCalls connected in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+        # Windows are usable by now, check that the cached extension state still holds
+        if extension_known:
+            try:
+                self.handle_extension_installation()
+            except Exception as e:
+                log.error(f"Failed to check the Window Calls extension. Error: {e}")
 
     def handle_extension_installation(self):
-        uuid = "window-calls@domandoman.xyz"
+        uuid = self.EXTENSION_UUID
 
         if uuid in self.extension_manager.get_installed_extensions():
             log.info(f"Extension {uuid} is already installed")
+            self.warm_start_cache.set_extension_installed(uuid, True)
         else:
-            self.extension_manager.install_extension(uuid)
+            installed = self.extension_manager.install_extension(uuid)
+            self.warm_start_cache.set_extension_installed(uuid, bool(installed))
 
         
 class ExtensionManager:
@@ -115,138 +213,3 @@ class ExtensionManager:
         
     def get_is_connected(self) -> bool:
         return None not in [self.gnome_shell_extensions, self.interface]
-        
-class WindowManager:
-    def __init__(self, bus):
-        self.bus = bus
-        self.proxy = None
-        self.interface = None
-        try:
-            self.proxy = bus.get_object("org.gnome.Shell", "/org/gnome/Shell/Extensions/Windows")
-            self.interface = dbus.Interface(self.proxy, "org.gnome.Shell.Extensions.Windows")
-        except dbus.exceptions.DBusException:
-            pass
-
-    def get_all_windows(self) -> list[dict]:
-        if not self.get_is_connected(): return []
-        try:
-            return json.loads(self.interface.List())
-        except Exception as e:
-            log.error(f"Failed to get all windows. Error: {e}")
-            return []
-    
-    def get_window_details(self, id: int) -> dict:
-        if not self.get_is_connected(): return {}
-        try:
-            return json.loads(self.interface.Details(str(id)))
-        except Exception as e:
-            log.error(f"Failed to get window details. Error: {e}")
-            return {}
-    
-    def move_window_to(self, id: int, x: int, y: int):
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Move(str(id), x, y)
-        except Exception as e:
-            log.error(f"Failed to move window. Error: {e}")
-
-    def move_resize_window(self, id: int, x: int, y: int, width: int, height: int):
-        if not self.get_is_connected(): return
-        try:
-            self.interface.MoveResize(str(id), x, y, width, height)
-        except Exception as e:
-            log.error(f"Failed to move and resize window. Error: {e}")
-
-    def resize_window_to(self, id: int, width: int, height: int):
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Resize(str(id), width, height)
-        except Exception as e:
-            log.error(f"Failed to resize window. Error: {e}")
-
-    def maximize_window(self, id: int) -> None:
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Maximize(str(id))
-        except Exception as e:
-            log.error(f"Failed to maximize window. Error: {e}")
-
-    def minimize_window(self, id: int) -> None:
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Minimize(str(id))
-        except Exception as e:
-            log.error(f"Failed to minimize window. Error: {e}")
-
-    def unmaximize_window(self, id: int) -> None:
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Unmaximize(str(id))
-        except Exception as e:
-            log.error(f"Failed to unmaximize window. Error: {e}")
-
-    def unminimize_window(self, id: int) -> None:
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Unminimize(str(id))
-        except Exception as e:
-            log.error(f"Failed to unminimize window. Error: {e}")
-
-    def activate_window(self, id: int) -> None:
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Activate(str(id))
-        except Exception as e:
-            log.error(f"Failed to activate window. Error: {e}")
-
-    def close_window(self, id: int) -> None:
-        if not self.get_is_connected(): return
-        try:
-            self.interface.Close(str(id))
-        except Exception as e:
-            log.error(f"Failed to close window. Error: {e}")
-
-    def get_title(self, id: int) -> str:
-        if not self.get_is_connected(): return ""
-        try:
-            return self.interface.GetTitle(str(id))
-        except Exception as e:
-            log.error(f"Failed to get title. Error: {e}")
-            return ""
-    
-    def get_all_wm_classes(self) -> list[str]:
-        if not self.get_is_connected(): return []
-        classes: str = []
-        for window in self.get_all_windows():
-            classes.append(window["wm_class"])
-        return classes
-    
-    def get_all_titles(self) -> list[str]:
-        if not self.get_is_connected(): return []
-        titles: str = []
-        for window in self.get_all_windows():
-            title = self.get_title(window["id"])
-            titles.append(str(title))
-        return titles
-    
-    def find_windows_by_class_and_title(self, wm_class_pattern: str, title_pattern: str) -> list[int]:
-        if not self.get_is_connected(): return []
-        matching_window_ids = []
-        all_windows = self.get_all_windows()
-
-        for window in all_windows:
-            try:
-                if window.get("wm_class", "") == None:
-                    continue
-                wm_class_match = re.search(wm_class_pattern, window.get("wm_class", ""), re.IGNORECASE)
-                title_match = re.search(title_pattern, self.get_title(window["id"]), re.IGNORECASE)
-            except re.error:
-                continue
-
-            if wm_class_match and title_match:
-                matching_window_ids.append(window["id"])
-
-        return matching_window_ids
-    
-    def get_is_connected(self) -> bool:
-        return None not in [self.proxy, self.interface]
\ No newline at end of file
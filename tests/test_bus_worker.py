@@ -0,0 +1,68 @@
+# Run from the plugin root: python -m pytest tests
+import threading
+import time
+import unittest
+
+from internal.BusWorker import BusWorker, PRIORITY_MUTATION, PRIORITY_USER, PRIORITY_BACKGROUND
+
+class BusWorkerTest(unittest.TestCase):
+    def setUp(self):
+        self.worker = BusWorker(max_workers=16)
+
+    def tearDown(self):
+        self.worker.shutdown()
+
+    def test_burst_runs_concurrently(self):
+        # A single warm idle thread must not serialize a burst
+        self.worker.submit(lambda: None).result()
+        start = time.monotonic()
+        futures = [self.worker.submit(time.sleep, 0.1) for _ in range(16)]
+        for future in futures:
+            future.result()
+        self.assertLess(time.monotonic() - start, 0.5)
+
+    def test_priority_order(self):
+        worker = BusWorker(max_workers=1)
+        gate = threading.Event()
+        order = []
+        try:
+            # Occupies the only thread, so everything below is queued before the first one runs
+            blocker = worker.submit(gate.wait)
+            futures = [
+                worker.submit(order.append, "background", priority=PRIORITY_BACKGROUND),
+                worker.submit(order.append, "user", priority=PRIORITY_USER),
+                worker.submit(order.append, "mutation", priority=PRIORITY_MUTATION),
+                worker.submit(order.append, "user 2", priority=PRIORITY_USER)
+            ]
+            gate.set()
+            blocker.result()
+            for future in futures:
+                future.result()
+        finally:
+            worker.shutdown()
+        self.assertEqual(order, ["mutation", "user", "user 2", "background"])
+
+    def test_identical_reads_are_merged(self):
+        gate = threading.Event()
+        calls = []
+
+        def read():
+            calls.append(1)
+            gate.wait()
+            return "reply"
+
+        first = self.worker.submit(read, key=("List",))
+        second = self.worker.submit(read, key=("List",))
+        self.assertIs(first, second)
+        gate.set()
+        self.assertEqual(first.result(), "reply")
+        self.assertEqual(len(calls), 1)
+
+        # A finished call is not joined
+        third = self.worker.submit(read, key=("List",))
+        self.assertIsNot(third, first)
+        third.result()
+        self.assertEqual(len(calls), 2)
+
+if __name__ == "__main__":
+    unittest.main()